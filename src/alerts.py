@@ -0,0 +1,129 @@
+import heapq
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+import pandas as pd
+
+
+class TopKAlertQueue:
+    """Keeps the k most suspicious cards of the current day while scored transactions stream in.
+
+    A card's suspiciousness is the maximum score of its transactions on that day, as in `card_precision_top_k_day`.
+    Cards confirmed as compromised on previous days are excluded, as with `remove_detected_compromised_cards`.
+
+    Args:
+        top_k (int): Number of cards analysts can investigate per day.
+    """
+
+    def __init__(self, top_k: int):
+        self.top_k = top_k
+        # min-heap of (score, -customer_id), may contain stale entries of cards whose score was raised. On tied
+        # scores, the card with the larger ID is evicted first, i.e., smaller IDs rank first as in
+        # `card_precision_top_k_day`.
+        self._heap: List[Tuple[float, int]] = []
+        # maximum score of each card currently in the queue
+        self._scores: Dict[int, float] = {}
+        self._excluded: Set[int] = set()
+
+    def update(self, customer_id: int, score: float) -> None:
+        """Updates the queue with a scored transaction in O(log k).
+
+        Args:
+            customer_id (int): Card of the transaction.
+            score (float): Predicted fraud probability of the transaction.
+        """
+        if customer_id in self._excluded:
+            return
+
+        # card already queued: raise its score if the new transaction is more suspicious
+        if customer_id in self._scores:
+            if score > self._scores[customer_id]:
+                self._scores[customer_id] = score
+                heapq.heappush(self._heap, (score, -customer_id))
+                if len(self._heap) > 2 * self.top_k:
+                    self._compact()
+            return
+
+        if len(self._scores) < self.top_k:
+            self._scores[customer_id] = score
+            heapq.heappush(self._heap, (score, -customer_id))
+            return
+
+        # replace the least suspicious queued card if the new card is more suspicious
+        self._drop_stale()
+        if (score, -customer_id) > self._heap[0]:
+            _, min_customer_id = heapq.heapreplace(self._heap, (score, -customer_id))
+            del self._scores[-min_customer_id]
+            self._scores[customer_id] = score
+
+    def exclude(self, customer_id: int) -> None:
+        """Removes a card confirmed as compromised from this and all following days.
+
+        Args:
+            customer_id (int): Compromised card.
+        """
+        self._excluded.add(customer_id)
+        if self._scores.pop(customer_id, None) is not None:
+            self._compact()
+
+    def queue(self) -> List[Tuple[int, float]]:
+        """Returns the current queue.
+
+        Returns:
+            List[Tuple[int, float]]: Cards and their scores, by decreasing order of suspiciousness (ties by card ID).
+        """
+        return sorted(self._scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def roll_over(self, compromised_cards: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """Closes the current day and starts an empty queue for the next day.
+
+        Args:
+            compromised_cards (Iterable[int], optional): Cards found to be compromised by the analysts. Those which
+                were in the queue are excluded from following days. Defaults to ().
+
+        Returns:
+            List[Tuple[int, float]]: Final queue of the closed day, by decreasing order of suspiciousness.
+        """
+        queue = self.queue()
+        self._excluded.update(set(compromised_cards).intersection(self._scores))
+        self._heap = []
+        self._scores = {}
+        return queue
+
+    def _drop_stale(self) -> None:
+        while self._heap and self._scores.get(-self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def _compact(self) -> None:
+        self._heap = [(score, -customer_id) for customer_id, score in self._scores.items()]
+        heapq.heapify(self._heap)
+
+
+def replay_predictions(predictions_df: pd.DataFrame, top_k: int) -> Tuple[List[Sequence[int]], List[float]]:
+    """Streams predictions through a `TopKAlertQueue` in chronological order, one day at a time.
+
+    Args:
+        predictions_df (pd.DataFrame): Predictions dataframe with tx_datetime, tx_time_days, customer_id, tx_fraud
+            and predictions.
+        top_k (int): Top k value.
+
+    Returns:
+        Tuple[List[Sequence[int]], List[float]]: Detected compromised cards per day, card precision top k per day.
+    """
+    alert_queue = TopKAlertQueue(top_k)
+
+    detected_compromised_cards_per_day = []
+    card_precision_top_k_per_day = []
+
+    for _, df_day in predictions_df.sort_values("tx_datetime").groupby("tx_time_days", sort=True):
+        for customer_id, score in zip(df_day.customer_id, df_day.predictions):
+            alert_queue.update(customer_id, score)
+
+        # analysts investigate the queued cards at the end of the day
+        compromised_cards = set(df_day[df_day.tx_fraud == 1].customer_id)
+        queue = alert_queue.roll_over(compromised_cards)
+        detected_compromised_cards = [customer_id for customer_id, _ in queue if customer_id in compromised_cards]
+
+        detected_compromised_cards_per_day.append(detected_compromised_cards)
+        card_precision_top_k_per_day.append(len(detected_compromised_cards) / top_k)
+
+    return detected_compromised_cards_per_day, card_precision_top_k_per_day
@@ -0,0 +1,284 @@
+import operator
+import time
+from typing import Callable, Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator
+
+from src.data.features import compute_features
+from src.metrics import evaluate_predictions
+
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "==": operator.eq}
+
+
+class EntityFeatures:
+    """Derives the features of some transactions from only the transactions of their customers and terminals.
+
+    Customer spending features only depend on earlier transactions of the same customer, and terminal risk features
+    only on earlier transactions of the same terminal within `max(window_sizes) + delay_period` days. So the features
+    of the target rows are the same as when calling `compute_features` on the whole context, but only the subset of
+    related transactions is processed. Use as `compute_features` hook of a `CascadeScorer`.
+
+    Args:
+        window_sizes (Sequence[int], optional): Window sizes in days. Defaults to [1, 7, 30].
+        delay_period (int, optional): Delay period for terminal risk features. Defaults to 7.
+        backend (str, optional): Backend of `compute_features`. Defaults to "pandas".
+    """
+
+    def __init__(self, window_sizes: Sequence[int] = [1, 7, 30], delay_period: int = 7, backend: str = "pandas"):
+        self.window_sizes = list(window_sizes)
+        self.delay_period = delay_period
+        self.backend = backend
+
+    def __call__(self, context_df: pd.DataFrame, rows: np.ndarray) -> pd.DataFrame:
+        """Derives the features of the transactions at the given row positions of the context.
+
+        Args:
+            context_df (pd.DataFrame): History followed by the transactions to score, with unique transaction IDs.
+            rows (np.ndarray): Row positions of the transactions to derive features for.
+
+        Returns:
+            pd.DataFrame: Transactions at the given positions with the derived features, in the order of the positions.
+        """
+        target_tx = context_df.iloc[rows]
+
+        # keep transactions of the same customers or terminals within the longest lookback window
+        lookback = pd.Timedelta(days=max(self.window_sizes) + self.delay_period)
+        related = (
+            context_df.customer_id.isin(target_tx.customer_id.unique())
+            | context_df.terminal_id.isin(target_tx.terminal_id.unique())
+        ) & (context_df.tx_datetime >= target_tx.tx_datetime.min() - lookback)
+
+        features_df = compute_features(
+            context_df[related].copy(),
+            window_sizes=self.window_sizes,
+            delay_period=self.delay_period,
+            backend=self.backend,
+        )
+        return features_df.set_index("transaction_id").loc[target_tx.transaction_id].reset_index()
+
+
+class CascadeScorer:
+    """Scores transactions in stages, so that only uncertain transactions pay for the full model.
+
+    1. Rules: cheap conditions on raw columns, e.g., `{"feature": "tx_amount", "operator": ">", "threshold": 220,
+       "score": 1.0}`, assign a fixed score.
+    2. First stage: a tiny model on cheap features resolves transactions with a predicted probability outside of
+       (lower_threshold, upper_threshold).
+    3. Model: the remaining transactions get full features (optional `compute_features`) and the main classifier.
+
+    Full features may depend on a transaction's history, e.g., rolling windows over earlier transactions of the same
+    customer. `compute_features` therefore receives the whole context, i.e., the history followed by the transactions
+    to score, together with the row positions of the uncertain transactions, and returns the features of those rows
+    only.
+
+    Args:
+        classifier (BaseEstimator): Main classifier.
+        input_features (Sequence[str]): Input features of the main classifier.
+        rules (Sequence[Dict], optional): Rules with feature, operator, threshold and score. Defaults to ().
+        first_stage (BaseEstimator, optional): Tiny first-stage classifier. Defaults to None, which skips the stage.
+        first_stage_features (Sequence[str], optional): Cheap input features of the first stage. Defaults to ().
+        lower_threshold (float, optional): First-stage probability up to which transactions are resolved as genuine.
+            Defaults to 0.01.
+        upper_threshold (float, optional): First-stage probability from which transactions are resolved as fraud.
+            Defaults to 0.99.
+        compute_features (Callable[[pd.DataFrame, np.ndarray], pd.DataFrame], optional): Derives the input features
+            of the transactions at the given row positions of the context, returning them in the order of the
+            positions. Defaults to None, which uses the given columns.
+    """
+
+    stages = ["rules", "first_stage", "model"]
+
+    def __init__(
+        self,
+        classifier: BaseEstimator,
+        input_features: Sequence[str],
+        rules: Sequence[Dict] = (),
+        first_stage: BaseEstimator = None,
+        first_stage_features: Sequence[str] = (),
+        lower_threshold: float = 0.01,
+        upper_threshold: float = 0.99,
+        compute_features: Callable[[pd.DataFrame, np.ndarray], pd.DataFrame] = None,
+    ):
+        for rule in rules:
+            if rule["operator"] not in OPERATORS:
+                raise ValueError(f"Unknown operator in rule: {rule['operator']}")
+
+        self.classifier = classifier
+        self.input_features = list(input_features)
+        self.rules = list(rules)
+        self.first_stage = first_stage
+        self.first_stage_features = list(first_stage_features)
+        self.lower_threshold = lower_threshold
+        self.upper_threshold = upper_threshold
+        self.compute_features = compute_features
+
+    @classmethod
+    def from_config(cls, config: dict, classifier: BaseEstimator, first_stage: BaseEstimator = None) -> "CascadeScorer":
+        """Creates a cascade scorer from the `cascade` section of the configuration file.
+
+        Full features of uncertain transactions are derived by `EntityFeatures` with the window sizes, delay period
+        and backend of the `data` section.
+
+        Args:
+            config (dict): Configuration, see `mvp/config.yaml`.
+            classifier (BaseEstimator): Main classifier.
+            first_stage (BaseEstimator, optional): Tiny first-stage classifier. Defaults to None, which skips the stage.
+
+        Returns:
+            CascadeScorer: Cascade scorer.
+        """
+        cascade_config = config["cascade"]
+        features_config = config["data"]["features"]
+        return cls(
+            classifier,
+            features_config["input_features"],
+            rules=cascade_config.get("rules", ()),
+            first_stage=first_stage,
+            first_stage_features=cascade_config.get("first_stage_features", ()),
+            lower_threshold=cascade_config.get("lower_threshold", 0.01),
+            upper_threshold=cascade_config.get("upper_threshold", 0.99),
+            compute_features=EntityFeatures(
+                window_sizes=features_config["window_sizes"],
+                delay_period=features_config["delay_period"],
+                backend=config["data"].get("backend", "pandas"),
+            ),
+        )
+
+    def fit(self, train_df: pd.DataFrame, output_feature: str) -> "CascadeScorer":
+        """Fits the first-stage and main classifiers on all training transactions.
+
+        Args:
+            train_df (pd.DataFrame): Training dataframe with all input features.
+            output_feature (str): Output feature.
+
+        Returns:
+            CascadeScorer: Fitted scorer.
+        """
+        if self.first_stage is not None:
+            self.first_stage.fit(train_df[self.first_stage_features], train_df[output_feature])
+        self.classifier.fit(train_df[self.input_features], train_df[output_feature])
+        return self
+
+    def predict(self, tx_df: pd.DataFrame, history_df: pd.DataFrame = None) -> Tuple[np.ndarray, pd.DataFrame]:
+        """Scores transactions through the cascade.
+
+        Args:
+            tx_df (pd.DataFrame): Transactions to score.
+            history_df (pd.DataFrame, optional): Earlier transactions that `compute_features` may use, but which are
+                not scored. Defaults to None.
+
+        Returns:
+            Tuple[np.ndarray, pd.DataFrame]: Predictions, and number and fraction of transactions resolved as well as
+                execution time per stage.
+        """
+        predictions = np.full(len(tx_df), np.nan)
+        unresolved = np.ones(len(tx_df), dtype=bool)
+        nb_resolved, execution_times = {}, {}
+
+        # Stage 1: rules
+        start_time = time.time()
+        for rule in self.rules:
+            matches = unresolved & OPERATORS[rule["operator"]](tx_df[rule["feature"]].to_numpy(), rule["threshold"])
+            predictions[matches] = rule["score"]
+            unresolved &= ~matches
+        execution_times["rules"] = time.time() - start_time
+        nb_resolved["rules"] = len(tx_df) - unresolved.sum()
+
+        # Stage 2: tiny model on cheap features
+        start_time = time.time()
+        rows = np.flatnonzero(unresolved)
+        if self.first_stage is not None and len(rows) > 0:
+            proba = self.first_stage.predict_proba(tx_df.iloc[rows][self.first_stage_features])[:, 1]
+            certain = (proba <= self.lower_threshold) | (proba >= self.upper_threshold)
+            predictions[rows[certain]] = proba[certain]
+            unresolved[rows[certain]] = False
+        execution_times["first_stage"] = time.time() - start_time
+        nb_resolved["first_stage"] = len(rows) - unresolved.sum()
+
+        # Stage 3: full features and main classifier
+        start_time = time.time()
+        rows = np.flatnonzero(unresolved)
+        if len(rows) > 0:
+            predictions[rows] = self.classifier.predict_proba(self.get_input_features(tx_df, rows, history_df))[:, 1]
+        execution_times["model"] = time.time() - start_time
+        nb_resolved["model"] = len(rows)
+
+        report = pd.DataFrame(
+            {
+                "nb_tx": [nb_resolved[stage] for stage in self.stages],
+                "fraction_resolved": [nb_resolved[stage] / max(len(tx_df), 1) for stage in self.stages],
+                "execution_time": [execution_times[stage] for stage in self.stages],
+            },
+            index=pd.Index(self.stages, name="stage"),
+        )
+
+        return predictions, report
+
+    def get_input_features(
+        self, tx_df: pd.DataFrame, rows: np.ndarray, history_df: pd.DataFrame = None
+    ) -> pd.DataFrame:
+        """Gets the input features of the main classifier for some of the transactions to score.
+
+        Args:
+            tx_df (pd.DataFrame): Transactions to score.
+            rows (np.ndarray): Row positions in `tx_df` of the transactions to get features for.
+            history_df (pd.DataFrame, optional): Earlier transactions that `compute_features` may use. Defaults to None.
+
+        Returns:
+            pd.DataFrame: Input features of the given transactions, in the order of the positions.
+        """
+        if self.compute_features is None:
+            return tx_df.iloc[rows][self.input_features]
+
+        if history_df is None or len(history_df) == 0:
+            return self.compute_features(tx_df, rows)[self.input_features]
+        context_df = pd.concat([history_df, tx_df], ignore_index=True)
+        return self.compute_features(context_df, len(history_df) + rows)[self.input_features]
+
+
+def compare_cascade(
+    cascade: CascadeScorer,
+    test_df: pd.DataFrame,
+    output_feature: str,
+    top_k_list: Sequence[int],
+    history_df: pd.DataFrame = None,
+) -> pd.DataFrame:
+    """Compares evaluation metrics and prediction time of a cascade with scoring all transactions by its classifier.
+
+    With a `compute_features` hook such as `EntityFeatures` (see `CascadeScorer.from_config`), test transactions only
+    need the rule and first-stage features. Full features are then derived within the prediction time of both modes:
+    for the uncertain transactions by the cascade, and for all transactions by the full model. The comparison thus
+    includes the savings in feature computation.
+
+    Args:
+        cascade (CascadeScorer): Fitted cascade scorer.
+        test_df (pd.DataFrame): Test dataframe.
+        output_feature (str): Output feature.
+        top_k_list (Sequence[int]): Top k values to compute card precision@k.
+        history_df (pd.DataFrame, optional): Earlier transactions that `compute_features` may use. Defaults to None.
+
+    Returns:
+        pd.DataFrame: Prediction execution time and evaluation metrics of both scoring modes.
+    """
+    predictions_df = test_df.copy()
+    results = {}
+
+    predictions, report = cascade.predict(predictions_df, history_df=history_df)
+    predictions_df["predictions"] = predictions
+    results["cascade"] = {
+        "prediction_execution_time": report.execution_time.sum(),
+        **evaluate_predictions(predictions_df, output_feature, "predictions", top_k_list),
+    }
+
+    start_time = time.time()
+    input_df = cascade.get_input_features(predictions_df, np.arange(len(predictions_df)), history_df)
+    predictions_df["predictions"] = cascade.classifier.predict_proba(input_df)[:, 1]
+    prediction_time = time.time() - start_time
+    results["full"] = {
+        "prediction_execution_time": prediction_time,
+        **evaluate_predictions(predictions_df, output_feature, "predictions", top_k_list),
+    }
+
+    return pd.DataFrame(results).T
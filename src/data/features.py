@@ -121,3 +121,56 @@ def get_terminal_risk_features(
     terminal_tx.fillna(0, inplace=True)
 
     return terminal_tx
+
+
+def compute_features(
+    tx_df: pd.DataFrame,
+    window_sizes: Sequence[int] = [1, 7, 30],
+    delay_period: int = 7,
+    backend: str = "pandas",
+    n_workers: int = None,
+) -> pd.DataFrame:
+    """Derives all transaction features with the given dataframe backend.
+
+    Args:
+        tx_df (pd.DataFrame): Transactions.
+        window_sizes (Sequence[int], optional): Window sizes in days. Defaults to [1, 7, 30].
+        delay_period (int, optional): Delay period for terminal risk features. Defaults to 7.
+        backend (str, optional): Either "pandas", "polars" (lazy, multi-threaded) or "parallel" (pandas over a process
+            pool, sharded by customer and terminal). Defaults to "pandas".
+        n_workers (int, optional): Number of worker processes of the parallel backend. Defaults to None, which uses
+            all CPUs.
+
+    Returns:
+        pd.DataFrame: Transactions with the derived features, sorted by datetime.
+    """
+    if backend == "polars":
+        from src.data.polars_backend import get_features
+
+        return get_features(tx_df, window_sizes=window_sizes, delay_period=delay_period).collect().to_pandas()
+    if backend not in ["pandas", "parallel"]:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    # vectorized equivalents of `is_weekend` and `is_night`
+    tx_df["tx_during_weekend"] = (tx_df.tx_datetime.dt.weekday >= 5).astype(int)
+    tx_df["tx_during_night"] = (tx_df.tx_datetime.dt.hour <= 6).astype(int)
+
+    if backend == "parallel":
+        from src.data.parallel import get_entity_features_parallel
+
+        tx_df = get_entity_features_parallel(
+            tx_df, window_sizes=window_sizes, delay_period=delay_period, n_workers=n_workers
+        )
+        return tx_df.sort_values("tx_datetime").reset_index(drop=True)
+
+    tx_df = tx_df.groupby("customer_id", group_keys=False).apply(
+        lambda x: get_customer_spending_features(x, window_sizes=window_sizes)
+    )
+    tx_df = tx_df.sort_values("tx_datetime").reset_index(drop=True)
+
+    tx_df = tx_df.groupby("terminal_id", group_keys=False).apply(
+        lambda x: get_terminal_risk_features(x, delay_period=delay_period, window_sizes=window_sizes)
+    )
+    tx_df = tx_df.sort_values("tx_datetime").reset_index(drop=True)
+
+    return tx_df
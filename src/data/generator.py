@@ -1,6 +1,7 @@
 import random
 import time
-from typing import Sequence
+from dataclasses import dataclass
+from typing import Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -210,7 +211,64 @@ def generate_dataset(
     return (customer_profiles_table, terminal_profiles_table, transactions_df)
 
 
-def add_frauds(
+@dataclass(frozen=True, eq=False)
+class FraudOverlay:
+    """Sparse delta of a fraud scenario configuration on top of an immutable transactions table.
+
+    Only the positions of fraudulent transactions, their scenario and the changed amounts (scenario 3) are stored,
+    so many fraud configurations can share a single base table.
+
+    Args:
+        fraud_index (np.ndarray): Row positions of fraudulent transactions.
+        fraud_scenario (np.ndarray): Fraud scenario of each fraudulent transaction.
+        amount_index (np.ndarray): Row positions of transactions with changed amounts.
+        tx_amount (np.ndarray): New amount of each of these transactions.
+        nb_frauds_per_scenario (Tuple[int, int, int]): Number of frauds added by scenarios 1, 2 and 3.
+    """
+
+    fraud_index: np.ndarray
+    fraud_scenario: np.ndarray
+    amount_index: np.ndarray
+    tx_amount: np.ndarray
+    nb_frauds_per_scenario: Tuple[int, int, int]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the overlay in bytes."""
+        return self.fraud_index.nbytes + self.fraud_scenario.nbytes + self.amount_index.nbytes + self.tx_amount.nbytes
+
+    def apply(self, transactions_df: pd.DataFrame) -> pd.DataFrame:
+        """Writes the fraud indicators and changed amounts into the given transactions table (in place).
+
+        Args:
+            transactions_df (pd.DataFrame): Transactions table the overlay was derived from.
+
+        Returns:
+            pd.DataFrame: Transactions table with fraud indicators.
+        """
+        transactions_df["tx_fraud"] = 0
+        transactions_df["tx_fraud_scenario"] = 0
+        transactions_df.iloc[self.fraud_index, transactions_df.columns.get_loc("tx_fraud")] = 1
+        transactions_df.iloc[self.fraud_index, transactions_df.columns.get_loc("tx_fraud_scenario")] = (
+            self.fraud_scenario
+        )
+        transactions_df.iloc[self.amount_index, transactions_df.columns.get_loc("tx_amount")] = self.tx_amount
+
+        return transactions_df
+
+    def materialize(self, transactions_df: pd.DataFrame) -> pd.DataFrame:
+        """Creates a view of the transactions table with this fraud configuration, leaving the base table untouched.
+
+        Args:
+            transactions_df (pd.DataFrame): Transactions table the overlay was derived from.
+
+        Returns:
+            pd.DataFrame: Copy of the transactions table with fraud indicators.
+        """
+        return self.apply(transactions_df.copy())
+
+
+def get_fraud_overlay(
     customer_profiles_table: pd.DataFrame,
     terminal_profiles_table: pd.DataFrame,
     transactions_df: pd.DataFrame,
@@ -218,8 +276,8 @@ def add_frauds(
     compromised_terminal_duration: int = 28,
     num_compromised_customers_per_day: int = 3,
     compromised_customer_duration: int = 14,
-) -> pd.DataFrame:
-    """Adds columns with indicator for fraudulent transactions and the respective scenario.
+) -> FraudOverlay:
+    """Derives the fraudulent transactions of a fraud scenario configuration without modifying the transactions table.
 
     Args:
         customer_profiles_table (pd.DataFrame): Customer profiles table.
@@ -231,58 +289,110 @@ def add_frauds(
         compromised_customer_duration (int, optional): Duration of customer being compromised. Defaults to 14.
 
     Returns:
-        pd.DataFrame: Transactions table with fraud indicators.
+        FraudOverlay: Sparse fraud indicators and changed amounts.
     """
-    # By default, all transactions are genuine
-    transactions_df["tx_fraud"] = 0
-    transactions_df["tx_fraud_scenario"] = 0
+    tx_time_days = transactions_df.tx_time_days.to_numpy()
+    terminal_ids = transactions_df.terminal_id.to_numpy()
+    customer_ids = transactions_df.customer_id.to_numpy()
+    tx_amount = transactions_df.tx_amount.to_numpy()
+
+    # group row positions by day once, instead of scanning the whole table for every day
+    order = np.argsort(tx_time_days, kind="stable")
+    day_bounds = np.searchsorted(
+        tx_time_days[order],
+        np.arange(tx_time_days.max() + max(compromised_terminal_duration, compromised_customer_duration) + 1),
+    )
+
+    def rows_between(start_day: int, end_day: int) -> np.ndarray:
+        # row positions with start_day <= tx_time_days < end_day, grouped by day
+        return order[day_bounds[start_day] : day_bounds[end_day]]
+
+    # fraud scenario of each affected row position, later scenarios overwrite earlier ones
+    fraud_scenario = {}
 
     # Scenario 1
-    transactions_df.loc[transactions_df.tx_amount > 220, "tx_fraud"] = 1
-    transactions_df.loc[transactions_df.tx_amount > 220, "tx_fraud_scenario"] = 1
-    nb_frauds_scenario_1 = transactions_df.tx_fraud.sum()
-    print("Number of frauds from scenario 1: " + str(nb_frauds_scenario_1))
+    for position in np.flatnonzero(tx_amount > 220):
+        fraud_scenario[position] = 1
+    nb_frauds_scenario_1 = len(fraud_scenario)
 
     # Scenario 2
-    for day in range(transactions_df.tx_time_days.max()):
+    for day in range(tx_time_days.max()):
         compromised_terminals = terminal_profiles_table.terminal_id.sample(
             n=num_compomised_terminals_per_day, random_state=day
         )
 
-        compromised_transactions = transactions_df[
-            (transactions_df.tx_time_days >= day)
-            & (transactions_df.tx_time_days < day + compromised_terminal_duration)
-            & (transactions_df.terminal_id.isin(compromised_terminals))
-        ]
-
-        transactions_df.loc[compromised_transactions.index, "tx_fraud"] = 1
-        transactions_df.loc[compromised_transactions.index, "tx_fraud_scenario"] = 2
+        rows = rows_between(day, day + compromised_terminal_duration)
+        for position in rows[np.isin(terminal_ids[rows], compromised_terminals)]:
+            fraud_scenario[position] = 2
 
-    nb_frauds_scenario_2 = transactions_df.tx_fraud.sum() - nb_frauds_scenario_1
-    print("Number of frauds from scenario 2: " + str(nb_frauds_scenario_2))
+    nb_frauds_scenario_2 = len(fraud_scenario) - nb_frauds_scenario_1
 
     # Scenario 3
-    for day in range(transactions_df.tx_time_days.max()):
+    amounts = {}
+    for day in range(tx_time_days.max()):
         compromised_customers = customer_profiles_table.customer_id.sample(
             n=num_compromised_customers_per_day, random_state=day
         ).values
 
-        compromised_transactions = transactions_df[
-            (transactions_df.tx_time_days >= day)
-            & (transactions_df.tx_time_days < day + compromised_customer_duration)
-            & (transactions_df.customer_id.isin(compromised_customers))
-        ]
-
-        nb_compromised_transactions = len(compromised_transactions)
+        # random.sample depends on the order of candidates, so restore table order
+        rows = rows_between(day, day + compromised_customer_duration)
+        compromised_transactions = np.sort(rows[np.isin(customer_ids[rows], compromised_customers)])
 
         random.seed(day)
-        index_fauds = random.sample(list(compromised_transactions.index.values), k=int(nb_compromised_transactions / 3))
+        index_frauds = random.sample(list(compromised_transactions), k=int(len(compromised_transactions) / 3))
+
+        for position in index_frauds:
+            amounts[position] = amounts.get(position, tx_amount[position]) * 5
+            fraud_scenario[position] = 3
 
-        transactions_df.loc[index_fauds, "tx_amount"] = transactions_df.loc[index_fauds, "tx_amount"] * 5
-        transactions_df.loc[index_fauds, "tx_fraud"] = 1
-        transactions_df.loc[index_fauds, "tx_fraud_scenario"] = 3
+    nb_frauds_scenario_3 = len(fraud_scenario) - nb_frauds_scenario_2 - nb_frauds_scenario_1
+
+    fraud_index = np.array(sorted(fraud_scenario), dtype=np.int64)
+    amount_index = np.array(sorted(amounts), dtype=np.int64)
+
+    return FraudOverlay(
+        fraud_index=fraud_index,
+        fraud_scenario=np.array([fraud_scenario[p] for p in fraud_index], dtype=np.int8),
+        amount_index=amount_index,
+        tx_amount=np.array([amounts[p] for p in amount_index], dtype=tx_amount.dtype),
+        nb_frauds_per_scenario=(nb_frauds_scenario_1, nb_frauds_scenario_2, nb_frauds_scenario_3),
+    )
+
+
+def add_frauds(
+    customer_profiles_table: pd.DataFrame,
+    terminal_profiles_table: pd.DataFrame,
+    transactions_df: pd.DataFrame,
+    num_compomised_terminals_per_day: int = 2,
+    compromised_terminal_duration: int = 28,
+    num_compromised_customers_per_day: int = 3,
+    compromised_customer_duration: int = 14,
+) -> pd.DataFrame:
+    """Adds columns with indicator for fraudulent transactions and the respective scenario.
+
+    Args:
+        customer_profiles_table (pd.DataFrame): Customer profiles table.
+        terminal_profiles_table (pd.DataFrame): Terminal profiles table.
+        transactions_df (pd.DataFrame): Transactions table.
+        num_compomised_terminals_per_day (int, optional): Number of random compromised terminals per day (scenario 2).
+        compromised_terminal_duration (int, optional): Duration of terminal being compromised in days. Defaults to 28.
+        num_compromised_customers_per_day (int, optional): Number of random compromised customers per day (scenario 3).
+        compromised_customer_duration (int, optional): Duration of customer being compromised. Defaults to 14.
+
+    Returns:
+        pd.DataFrame: Transactions table with fraud indicators.
+    """
+    overlay = get_fraud_overlay(
+        customer_profiles_table,
+        terminal_profiles_table,
+        transactions_df,
+        num_compomised_terminals_per_day=num_compomised_terminals_per_day,
+        compromised_terminal_duration=compromised_terminal_duration,
+        num_compromised_customers_per_day=num_compromised_customers_per_day,
+        compromised_customer_duration=compromised_customer_duration,
+    )
 
-    nb_frauds_scenario_3 = transactions_df.tx_fraud.sum() - nb_frauds_scenario_2 - nb_frauds_scenario_1
-    print("Number of frauds from scenario 3: " + str(nb_frauds_scenario_3))
+    for scenario, nb_frauds in enumerate(overlay.nb_frauds_per_scenario, start=1):
+        print(f"Number of frauds from scenario {scenario}: {nb_frauds}")
 
-    return transactions_df
+    return overlay.apply(transactions_df)
@@ -0,0 +1,105 @@
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def build_incidence_matrix(
+    customer_ids: np.ndarray, terminal_ids: np.ndarray, n_customers: int, n_terminals: int
+) -> sparse.csr_matrix:
+    """Builds a sparse customer x terminal incidence matrix counting transactions per customer and terminal.
+
+    Memory is proportional to the number of distinct customer-terminal pairs, not to the number of customers times
+    the number of terminals.
+
+    Args:
+        customer_ids (np.ndarray): Customer ID of each transaction.
+        terminal_ids (np.ndarray): Terminal ID of each transaction.
+        n_customers (int): Number of customers (rows).
+        n_terminals (int): Number of terminals (columns).
+
+    Returns:
+        sparse.csr_matrix: Incidence matrix with number of transactions per customer and terminal.
+    """
+    # duplicate (customer, terminal) entries are summed when converting to CSR
+    return sparse.coo_matrix(
+        (np.ones(len(customer_ids)), (customer_ids, terminal_ids)), shape=(n_customers, n_terminals)
+    ).tocsr()
+
+
+def get_customer_terminal_risk_features(
+    tx_df: pd.DataFrame, delay_period: int = 7, window_sizes: Sequence[int] = [1, 7, 30]
+) -> pd.DataFrame:
+    """Derives the risk of the terminals a customer recently visited by propagating terminal risk over the graph.
+
+    For a transaction on day d and window size ws, the terminal risk is the fraud rate on days [d - delay - ws,
+    d - delay), i.e., only using fraud labels that are already known. It is propagated to the customer as the
+    visit-weighted average over terminals visited on days [d - ws, d), computed as a sparse matrix product of the
+    rolling incidence matrix and the terminal risk vector.
+
+    Args:
+        tx_df (pd.DataFrame): Transactions with customer_id, terminal_id, tx_time_days and tx_fraud.
+        delay_period (int, optional): Period after which risk indicator (e.g., fraud label) is available. Defaults to 7.
+        window_sizes (Sequence[int], optional): Window sizes in days. Defaults to [1, 7, 30].
+
+    Returns:
+        pd.DataFrame: Given transactions with the derived features.
+    """
+    customer_ids = tx_df.customer_id.to_numpy()
+    terminal_ids = tx_df.terminal_id.to_numpy()
+    tx_fraud = tx_df.tx_fraud.to_numpy(dtype=float)
+    n_customers = customer_ids.max() + 1
+    n_terminals = terminal_ids.max() + 1
+
+    # group row positions by day
+    days = tx_df.tx_time_days.to_numpy()
+    order = np.argsort(days, kind="stable")
+    first_day, last_day = days.min(), days.max()
+    day_bounds = np.searchsorted(days[order], np.arange(first_day, last_day + 2))
+
+    def day_rows(day: int) -> np.ndarray:
+        if day < first_day or day > last_day:
+            return order[:0]
+        return order[day_bounds[day - first_day] : day_bounds[day - first_day + 1]]
+
+    features = {ws: np.zeros(len(tx_df)) for ws in window_sizes}
+
+    for ws in window_sizes:
+        # rolling state: customer x terminal visits and per-terminal transaction and fraud counts
+        visits = sparse.csr_matrix((n_customers, n_terminals))
+        nb_tx = np.zeros(n_terminals)
+        nb_fraud = np.zeros(n_terminals)
+
+        for day in range(first_day, last_day + 1):
+            # slide visit window [day - ws, day)
+            added, removed = day_rows(day - 1), day_rows(day - ws - 1)
+            visits = (
+                visits
+                + build_incidence_matrix(customer_ids[added], terminal_ids[added], n_customers, n_terminals)
+                - build_incidence_matrix(customer_ids[removed], terminal_ids[removed], n_customers, n_terminals)
+            )
+            visits.eliminate_zeros()
+
+            # slide risk window [day - delay - ws, day - delay)
+            added, removed = day_rows(day - delay_period - 1), day_rows(day - delay_period - ws - 1)
+            np.add.at(nb_tx, terminal_ids[added], 1)
+            np.add.at(nb_tx, terminal_ids[removed], -1)
+            np.add.at(nb_fraud, terminal_ids[added], tx_fraud[added])
+            np.add.at(nb_fraud, terminal_ids[removed], -tx_fraud[removed])
+
+            # compute the fraud rate of each terminal (0 if no transactions in window)
+            terminal_risk = np.divide(nb_fraud, nb_tx, out=np.zeros(n_terminals), where=nb_tx > 0)
+
+            # propagate terminal risk to customers as visit-weighted average
+            nb_visits = np.asarray(visits.sum(axis=1)).ravel()
+            customer_risk = np.divide(visits @ terminal_risk, nb_visits, out=np.zeros(n_customers), where=nb_visits > 0)
+
+            rows = day_rows(day)
+            features[ws][rows] = customer_risk[customer_ids[rows]]
+
+    tx_df = tx_df.copy()
+    for ws in window_sizes:
+        tx_df[f"customer_id_terminal_risk_{ws}_day_window"] = features[ws]
+
+    return tx_df
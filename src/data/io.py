@@ -1,40 +1,88 @@
 from pathlib import Path
+from typing import Iterator, List
 
 import pandas as pd
 
 
-def load_dataframes(directory: Path, start_date: str = None, end_date: str = None, sort_by: str = None) -> pd.DataFrame:
-    """Loads dataframes from a directory of pickle files. Assumes filenames to be in the format YYYY-MM-DD.pkl.
+def list_partitions(directory: Path, start_date: str = None, end_date: str = None) -> List[Path]:
+    """Lists daily partition files in a directory. Assumes filenames to be in the format YYYY-MM-DD.pkl.
 
     Args:
         directory (Path): Directory containing pickle files.
         start_date (str, optional): Start date. Defaults to None, which takes all files from the start.
         end_date (str, optional): End date. Defaults to None, which takes all files until the end.
-        sort_by (str, optional): Columns to sort combined dataframe by. Defaults to None.
 
     Returns:
-        pd.DataFrame: (Sorted) combined dataframe.
+        List[Path]: Chronologically sorted partition files.
     """
     # Get a list of all files in the directory
     files = sorted(directory.glob("*.pkl"))
 
-    # Filter files based on start and end dates
+    # Filter files based on start and end dates (file stems are ISO dates, so they sort lexicographically)
     if start_date is not None:
-        files = [f for f in files if f >= start_date]
+        files = [f for f in files if f.stem >= str(start_date)]
     if end_date is not None:
-        files = [f for f in files if f <= end_date]
+        files = [f for f in files if f.stem <= str(end_date)]
+
+    return files
+
+
+def iter_dataframes(directory: Path, start_date: str = None, end_date: str = None) -> Iterator[pd.DataFrame]:
+    """Lazily loads dataframes from a directory of pickle files, one daily partition at a time.
+
+    Args:
+        directory (Path): Directory containing pickle files.
+        start_date (str, optional): Start date. Defaults to None, which takes all files from the start.
+        end_date (str, optional): End date. Defaults to None, which takes all files until the end.
 
-    # Load dataframes from files
-    dataframes = []
-    for file in files:
+    Yields:
+        pd.DataFrame: Dataframe of a single partition.
+    """
+    for file in list_partitions(directory, start_date=start_date, end_date=end_date):
         with open(file, "rb") as f:
-            dataframes.append(pd.read_pickle(f))
+            yield pd.read_pickle(f)
+
 
+def load_dataframes(directory: Path, start_date: str = None, end_date: str = None, sort_by: str = None) -> pd.DataFrame:
+    """Loads dataframes from a directory of pickle files. Assumes filenames to be in the format YYYY-MM-DD.pkl.
+
+    Args:
+        directory (Path): Directory containing pickle files.
+        start_date (str, optional): Start date. Defaults to None, which takes all files from the start.
+        end_date (str, optional): End date. Defaults to None, which takes all files until the end.
+        sort_by (str, optional): Columns to sort combined dataframe by. Defaults to None.
+
+    Returns:
+        pd.DataFrame: (Sorted) combined dataframe.
+    """
     # Combine dataframes into one dataframe
-    combined_dataframe = pd.concat(dataframes)
+    combined_dataframe = pd.concat(list(iter_dataframes(directory, start_date=start_date, end_date=end_date)))
 
     # Sort dataframe by datetime column if sort_by is specified
     if sort_by is not None:
         combined_dataframe.sort_values(by=sort_by, inplace=True)
 
     return combined_dataframe
+
+
+def save_partitions(tx_df: pd.DataFrame, directory: Path, datetime_column: str = "tx_datetime") -> List[Path]:
+    """Saves a dataframe as daily partitions in the format YYYY-MM-DD.pkl, as read by `load_dataframes`.
+
+    Args:
+        tx_df (pd.DataFrame): Dataframe to partition, e.g., transactions with features.
+        directory (Path): Directory to write pickle files to.
+        datetime_column (str, optional): Datetime column to partition by. Defaults to "tx_datetime".
+
+    Returns:
+        List[Path]: Chronologically sorted partition files.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+
+    files = []
+    dates = pd.to_datetime(tx_df[datetime_column]).dt.strftime("%Y-%m-%d")
+    for date, day_df in tx_df.groupby(dates, sort=True):
+        file = directory / f"{date}.pkl"
+        day_df.sort_values(datetime_column).to_pickle(file)
+        files.append(file)
+
+    return files
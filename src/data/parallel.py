@@ -0,0 +1,240 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.features import get_customer_spending_features, get_terminal_risk_features
+
+# name, dtype and shape of each column block in shared memory
+ArraySpecs = Dict[str, Tuple[str, str, Tuple[int, ...]]]
+
+
+def _share_arrays(arrays: Dict[str, np.ndarray]) -> Tuple[List[shared_memory.SharedMemory], ArraySpecs]:
+    """Copies arrays into new shared memory blocks.
+
+    Args:
+        arrays (Dict[str, np.ndarray]): Arrays by column name.
+
+    Returns:
+        Tuple[List[shared_memory.SharedMemory], ArraySpecs]: Shared memory blocks and specs to attach to them.
+    """
+    blocks, specs = [], {}
+    for column, array in arrays.items():
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        blocks.append(block)
+        specs[column] = (block.name, array.dtype.str, array.shape)
+    return blocks, specs
+
+
+def _attach_arrays(specs: ArraySpecs) -> Tuple[List[shared_memory.SharedMemory], Dict[str, np.ndarray]]:
+    """Attaches to arrays in existing shared memory blocks without copying them.
+
+    Args:
+        specs (ArraySpecs): Specs returned by `_share_arrays`.
+
+    Returns:
+        Tuple[List[shared_memory.SharedMemory], Dict[str, np.ndarray]]: Shared memory blocks and arrays by column name.
+    """
+    blocks, arrays = [], {}
+    for column, (name, dtype, shape) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays[column] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    return blocks, arrays
+
+
+def _compute_shard(
+    inputs: ArraySpecs,
+    outputs: ArraySpecs,
+    entity: str,
+    start: int,
+    end: int,
+    window_sizes: Sequence[int],
+    delay_period: int,
+) -> int:
+    """Computes the features of one entity shard in a worker process and writes them to shared memory.
+
+    Args:
+        inputs (ArraySpecs): Shared input columns, including the row permutation grouping shards of the entity.
+        outputs (ArraySpecs): Shared output feature columns, written at the original row positions.
+        entity (str): Either "customer_id" or "terminal_id".
+        start (int): Offset of the shard in the row permutation of the entity.
+        end (int): End offset (exclusive) of the shard in the row permutation of the entity.
+        window_sizes (Sequence[int]): Window sizes in days.
+        delay_period (int): Delay period for terminal risk features.
+
+    Returns:
+        int: Number of transactions in the shard.
+    """
+    input_blocks, input_arrays = _attach_arrays(inputs)
+    output_blocks, output_arrays = _attach_arrays(outputs)
+
+    try:
+        rows = input_arrays[f"{entity}_order"][start:end]
+        shard_tx = pd.DataFrame(
+            {
+                "row": rows,
+                "transaction_id": input_arrays["transaction_id"][rows],
+                "tx_datetime": pd.to_datetime(input_arrays["tx_datetime"][rows]),
+                entity: input_arrays[entity][rows],
+                "tx_amount": input_arrays["tx_amount"][rows],
+                "tx_fraud": input_arrays["tx_fraud"][rows],
+            }
+        )
+
+        if len(shard_tx) > 0:
+            if entity == "customer_id":
+                shard_tx = shard_tx.groupby(entity, group_keys=False).apply(
+                    lambda x: get_customer_spending_features(x, window_sizes=window_sizes)
+                )
+            else:
+                shard_tx = shard_tx.groupby(entity, group_keys=False).apply(
+                    lambda x: get_terminal_risk_features(x, delay_period=delay_period, window_sizes=window_sizes)
+                )
+
+            # stitch results back in original row order
+            for column in outputs:
+                output_arrays[column][shard_tx.row.values] = shard_tx[column].values
+
+        return len(rows)
+    finally:
+        del input_arrays, output_arrays
+        for block in input_blocks + output_blocks:
+            block.close()
+
+
+def get_entity_features_parallel(
+    tx_df: pd.DataFrame,
+    window_sizes: Sequence[int] = [1, 7, 30],
+    delay_period: int = 7,
+    n_workers: int = None,
+    n_shards: int = None,
+) -> pd.DataFrame:
+    """Derives customer spending and terminal risk features in parallel over hash-partitioned entity shards.
+
+    Customer features only depend on a customer's transactions, and terminal features only on a terminal's, so both
+    are computed independently per shard in a process pool. Columns are passed to the workers through shared memory
+    and results are written back at the original row positions.
+
+    Args:
+        tx_df (pd.DataFrame): Transactions.
+        window_sizes (Sequence[int], optional): Window sizes in days. Defaults to [1, 7, 30].
+        delay_period (int, optional): Delay period for terminal risk features. Defaults to 7.
+        n_workers (int, optional): Number of worker processes. Defaults to None, which uses all CPUs.
+        n_shards (int, optional): Number of shards per entity. Defaults to None, which uses four per worker.
+
+    Returns:
+        pd.DataFrame: Given transactions with the derived features, in original row order.
+    """
+    n_workers = n_workers or os.cpu_count()
+    n_shards = n_shards or 4 * n_workers
+
+    customer_features = [
+        f"customer_id_{feature}_{ws}_day_window" for ws in window_sizes for feature in ["nb_tx", "avg_amount"]
+    ]
+    terminal_features = [
+        f"terminal_id_{feature}_{ws}_day_window" for ws in window_sizes for feature in ["nb_tx", "risk"]
+    ]
+
+    # hash partition by entity ID: a stable sort by shard groups the rows of each shard, in original row order
+    orders, shard_bounds = {}, {}
+    for entity in ["customer_id", "terminal_id"]:
+        shards = tx_df[entity].to_numpy() % n_shards
+        orders[f"{entity}_order"] = np.argsort(shards, kind="stable")
+        shard_bounds[entity] = np.searchsorted(shards[orders[f"{entity}_order"]], np.arange(n_shards + 1))
+
+    input_blocks, inputs = _share_arrays(
+        {
+            "transaction_id": tx_df.transaction_id.to_numpy(),
+            "tx_datetime": tx_df.tx_datetime.to_numpy(dtype="datetime64[ns]").view("int64"),
+            "customer_id": tx_df.customer_id.to_numpy(),
+            "terminal_id": tx_df.terminal_id.to_numpy(),
+            "tx_amount": tx_df.tx_amount.to_numpy(dtype=float),
+            "tx_fraud": tx_df.tx_fraud.to_numpy(),
+            **orders,
+        }
+    )
+    output_blocks, outputs = _share_arrays(
+        {feature: np.zeros(len(tx_df)) for feature in customer_features + terminal_features}
+    )
+
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [
+                executor.submit(
+                    _compute_shard,
+                    inputs,
+                    {feature: outputs[feature] for feature in features},
+                    entity,
+                    shard_bounds[entity][shard],
+                    shard_bounds[entity][shard + 1],
+                    window_sizes,
+                    delay_period,
+                )
+                for entity, features in [("customer_id", customer_features), ("terminal_id", terminal_features)]
+                for shard in range(n_shards)
+            ]
+            for future in futures:
+                future.result()
+
+        tx_df = tx_df.copy()
+        for block, (feature, (_, dtype, shape)) in zip(output_blocks, outputs.items()):
+            tx_df[feature] = np.ndarray(shape, dtype=dtype, buffer=block.buf).copy()
+    finally:
+        for block in input_blocks + output_blocks:
+            block.close()
+            block.unlink()
+
+    return tx_df
+
+
+def benchmark_parallel(
+    tx_df: pd.DataFrame,
+    n_workers_list: Sequence[int] = [1, 2, 4, 8],
+    window_sizes: Sequence[int] = [1, 7, 30],
+    delay_period: int = 7,
+) -> pd.DataFrame:
+    """Measures how feature computation with the parallel backend scales with the number of worker processes.
+
+    Args:
+        tx_df (pd.DataFrame): Transactions.
+        n_workers_list (Sequence[int], optional): Numbers of worker processes. Defaults to [1, 2, 4, 8].
+        window_sizes (Sequence[int], optional): Window sizes in days. Defaults to [1, 7, 30].
+        delay_period (int, optional): Delay period for terminal risk features. Defaults to 7.
+
+    Returns:
+        pd.DataFrame: Execution time in seconds and speedup over the sequential pandas backend per number of workers.
+    """
+    from src.data.features import compute_features
+
+    # compute_features adds columns in place, so copy the frame outside of the timed section
+    pandas_tx_df = tx_df.copy()
+    start_time = time.time()
+    compute_features(pandas_tx_df, window_sizes=window_sizes, delay_period=delay_period)
+    pandas_time = time.time() - start_time
+
+    execution_times = []
+    for n_workers in n_workers_list:
+        parallel_tx_df = tx_df.copy()
+        start_time = time.time()
+        compute_features(
+            parallel_tx_df,
+            window_sizes=window_sizes,
+            delay_period=delay_period,
+            backend="parallel",
+            n_workers=n_workers,
+        )
+        execution_times.append(time.time() - start_time)
+
+    return pd.DataFrame(
+        {
+            "execution_time": execution_times,
+            "speedup": [pandas_time / execution_time for execution_time in execution_times],
+        },
+        index=pd.Index(n_workers_list, name="n_workers"),
+    )
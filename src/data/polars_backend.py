@@ -0,0 +1,284 @@
+import datetime
+import time
+from typing import Sequence, Tuple, Union
+
+import pandas as pd
+import polars as pl
+
+
+def _later_ties(expr: pl.Expr, entity: str) -> pl.Expr:
+    """Sums the given expression over later transactions of the same entity with an identical timestamp.
+
+    Time-based rolling windows in pandas end at the current row, whereas polars includes all rows with the same
+    timestamp. Subtracting this term restores the pandas semantics (rows ordered by datetime and transaction ID).
+
+    Args:
+        expr (pl.Expr): Expression to sum.
+        entity (str): Entity column, e.g., "customer_id".
+
+    Returns:
+        pl.Expr: Sum over later rows with identical timestamp.
+    """
+    return (expr.cum_sum(reverse=True) - expr).over([entity, "tx_datetime"])
+
+
+def add_datetime_features(tx: pl.LazyFrame) -> pl.LazyFrame:
+    """Adds weekend and night indicators, equivalent to `is_weekend` and `is_night`.
+
+    Args:
+        tx (pl.LazyFrame): Transactions.
+
+    Returns:
+        pl.LazyFrame: Transactions with the derived features.
+    """
+    return tx.with_columns(
+        # polars weekdays range from 1 (Monday) to 7 (Sunday)
+        tx_during_weekend=(pl.col("tx_datetime").dt.weekday() >= 6).cast(pl.Int64),
+        tx_during_night=(pl.col("tx_datetime").dt.hour() <= 6).cast(pl.Int64),
+    )
+
+
+def add_customer_spending_features(tx: pl.LazyFrame, window_sizes: Sequence[int] = [1, 7, 30]) -> pl.LazyFrame:
+    """Adds recency, frequency and monetary features, equivalent to `get_customer_spending_features`.
+
+    Args:
+        tx (pl.LazyFrame): Transactions sorted by datetime and transaction ID.
+        window_sizes (Sequence[int], optional): Window sizes in days. Defaults to [1, 7, 30].
+
+    Returns:
+        pl.LazyFrame: Transactions with the derived features.
+    """
+    amount = pl.col("tx_amount")
+    is_tx = amount.is_not_null().cast(pl.Float64)
+
+    features = []
+    for ws in window_sizes:
+        # compute sum and number of transactions for this window size
+        sum_amount_tx_window = amount.rolling_sum_by("tx_datetime", f"{ws}d").over("customer_id") - _later_ties(
+            amount, "customer_id"
+        )
+        nb_tx_window = is_tx.rolling_sum_by("tx_datetime", f"{ws}d").over("customer_id") - _later_ties(
+            is_tx, "customer_id"
+        )
+
+        features.append(nb_tx_window.alias(f"customer_id_nb_tx_{ws}_day_window"))
+        features.append((sum_amount_tx_window / nb_tx_window).alias(f"customer_id_avg_amount_{ws}_day_window"))
+
+    return tx.with_columns(features)
+
+
+def add_terminal_risk_features(
+    tx: pl.LazyFrame, delay_period: int = 7, window_sizes: Sequence[int] = [1, 7, 30]
+) -> pl.LazyFrame:
+    """Adds risk-related features, equivalent to `get_terminal_risk_features`.
+
+    Args:
+        tx (pl.LazyFrame): Transactions sorted by datetime and transaction ID.
+        delay_period (int, optional): Period after which risk indicator (e.g., fraud label) is available. Defaults to 7.
+        window_sizes (Sequence[int], optional): Window sizes. Defaults to [1, 7, 30].
+
+    Returns:
+        pl.LazyFrame: Transactions with the derived features.
+    """
+    fraud = pl.col("tx_fraud").cast(pl.Float64)
+    is_tx = pl.col("tx_fraud").is_not_null().cast(pl.Float64)
+
+    # window differences cancel out rows with identical timestamps, so no tie correction is needed here
+    nb_tx_delay_period = is_tx.rolling_sum_by("tx_datetime", f"{delay_period}d").over("terminal_id")
+    nb_fraud_delay_period = fraud.rolling_sum_by("tx_datetime", f"{delay_period}d").over("terminal_id")
+
+    features = []
+    for ws in window_sizes:
+        nb_fraud_delay_window = fraud.rolling_sum_by("tx_datetime", f"{ws + delay_period}d").over("terminal_id")
+        nb_tx_delay_window = is_tx.rolling_sum_by("tx_datetime", f"{ws + delay_period}d").over("terminal_id")
+
+        nb_fraud_window = nb_fraud_delay_window - nb_fraud_delay_period
+        nb_tx_window = nb_tx_delay_window - nb_tx_delay_period
+
+        # undefined risk scores (no transactions in window) are set to 0
+        risk_window = (nb_fraud_window / nb_tx_window).fill_nan(0)
+
+        features.append(nb_tx_window.alias(f"terminal_id_nb_tx_{ws}_day_window"))
+        features.append(risk_window.alias(f"terminal_id_risk_{ws}_day_window"))
+
+    return tx.with_columns(features)
+
+
+def get_features(
+    tx: Union[pl.LazyFrame, pd.DataFrame], window_sizes: Sequence[int] = [1, 7, 30], delay_period: int = 7
+) -> pl.LazyFrame:
+    """Builds a lazy query plan deriving all transaction features.
+
+    Args:
+        tx (Union[pl.LazyFrame, pd.DataFrame]): Transactions.
+        window_sizes (Sequence[int], optional): Window sizes in days. Defaults to [1, 7, 30].
+        delay_period (int, optional): Delay period for terminal risk features. Defaults to 7.
+
+    Returns:
+        pl.LazyFrame: Query plan for transactions with features, sorted by datetime.
+    """
+    if isinstance(tx, pd.DataFrame):
+        tx = pl.from_pandas(tx).lazy()
+
+    tx = tx.sort(["tx_datetime", "transaction_id"])
+    tx = add_datetime_features(tx)
+    tx = add_customer_spending_features(tx, window_sizes=window_sizes)
+    tx = add_terminal_risk_features(tx, delay_period=delay_period, window_sizes=window_sizes)
+
+    return tx
+
+
+def get_train_test_set(
+    tx: Union[pl.LazyFrame, pd.DataFrame],
+    start_date_training: datetime.datetime,
+    delta_train: int = 7,
+    delta_delay: int = 7,
+    delta_test: int = 7,
+) -> Tuple[pl.LazyFrame, pl.LazyFrame]:
+    """Builds lazy query plans for train and test sets, equivalent to `src.data.split.get_train_test_set`.
+
+    Args:
+        tx (Union[pl.LazyFrame, pd.DataFrame]): Transaction data
+        start_date_training (datetime.datetime): Datetime to start training
+        delta_train (int, optional): Number of days of training data. Defaults to 7.
+        delta_delay (int, optional): Delay period for identifying frauds. Defaults to 7.
+        delta_test (int, optional): Number of days of test data. Defaults to 7.
+
+    Returns:
+        Tuple[pl.LazyFrame, pl.LazyFrame]: Query plans for training and test sets
+    """
+    if isinstance(tx, pd.DataFrame):
+        tx = pl.from_pandas(tx).lazy()
+
+    train = tx.filter(
+        (pl.col("tx_datetime") >= start_date_training)
+        & (pl.col("tx_datetime") < start_date_training + datetime.timedelta(delta_train))
+    )
+
+    # the first training day is needed to build the day mappings below
+    start_tx_time_days_training = train.select(pl.col("tx_time_days").min()).collect().item()
+
+    # no transactions in the training period: empty training and test sets, as in the pandas implementation
+    if start_tx_time_days_training is None:
+        return train.sort("transaction_id"), tx.clear()
+
+    # test day index for each test day, and index from which frauds on each delay day are known
+    test_days = pl.LazyFrame(
+        {
+            "tx_time_days": [
+                start_tx_time_days_training + delta_train + delta_delay + day for day in range(delta_test)
+            ],
+            "test_day": list(range(delta_test)),
+        },
+        schema_overrides={"tx_time_days": tx.collect_schema()["tx_time_days"]},
+    )
+    delay_days = pl.LazyFrame(
+        {
+            "tx_time_days": [start_tx_time_days_training + delta_train * day - 1 for day in range(delta_test)],
+            "known_from": list(range(delta_test)),
+        },
+        schema_overrides={"tx_time_days": tx.collect_schema()["tx_time_days"]},
+    )
+
+    # Note: cards known to be defrauded after the delay period are removed from the test set
+    known_defrauded_customers = (
+        pl.concat(
+            [
+                train.filter(pl.col("tx_fraud") == 1).select("customer_id", known_from=pl.lit(-1, dtype=pl.Int64)),
+                tx.filter(pl.col("tx_fraud") == 1)
+                .join(delay_days, on="tx_time_days")
+                .select("customer_id", "known_from"),
+            ]
+        )
+        .group_by("customer_id")
+        .agg(pl.col("known_from").min())
+    )
+
+    test = (
+        tx.join(test_days, on="tx_time_days")
+        .join(known_defrauded_customers, on="customer_id", how="left")
+        .filter(pl.col("known_from").is_null() | (pl.col("known_from") > pl.col("test_day")))
+        .drop("test_day", "known_from")
+    )
+
+    return train.sort("transaction_id"), test.sort("transaction_id")
+
+
+def get_features_train_test_set(
+    tx: Union[pl.LazyFrame, pd.DataFrame],
+    start_date_training: datetime.datetime,
+    window_sizes: Sequence[int] = [1, 7, 30],
+    delay_period: int = 7,
+    delta_train: int = 7,
+    delta_delay: int = 7,
+    delta_test: int = 7,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Derives features and splits transactions into train and test sets, executed as a single optimised query.
+
+    Args:
+        tx (Union[pl.LazyFrame, pd.DataFrame]): Transaction data
+        start_date_training (datetime.datetime): Datetime to start training
+        window_sizes (Sequence[int], optional): Window sizes in days. Defaults to [1, 7, 30].
+        delay_period (int, optional): Delay period for terminal risk features. Defaults to 7.
+        delta_train (int, optional): Number of days of training data. Defaults to 7.
+        delta_delay (int, optional): Delay period for identifying frauds. Defaults to 7.
+        delta_test (int, optional): Number of days of test data. Defaults to 7.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Training and test sets
+    """
+    features = get_features(tx, window_sizes=window_sizes, delay_period=delay_period)
+    train, test = get_train_test_set(
+        features, start_date_training, delta_train=delta_train, delta_delay=delta_delay, delta_test=delta_test
+    )
+
+    # collect both plans together so that the shared feature subplan is computed only once
+    train, test = pl.collect_all([train, test])
+
+    return train.to_pandas(), test.to_pandas()
+
+
+def benchmark_backends(
+    tx_df: pd.DataFrame,
+    start_date_training: datetime.datetime,
+    window_sizes: Sequence[int] = [1, 7, 30],
+    delay_period: int = 7,
+    delta_train: int = 7,
+    delta_delay: int = 7,
+    delta_test: int = 7,
+) -> pd.DataFrame:
+    """Measures execution times of the pandas and polars feature and split pipelines side by side.
+
+    Args:
+        tx_df (pd.DataFrame): Transaction data
+        start_date_training (datetime.datetime): Datetime to start training
+        window_sizes (Sequence[int], optional): Window sizes in days. Defaults to [1, 7, 30].
+        delay_period (int, optional): Delay period for terminal risk features. Defaults to 7.
+        delta_train (int, optional): Number of days of training data. Defaults to 7.
+        delta_delay (int, optional): Delay period for identifying frauds. Defaults to 7.
+        delta_test (int, optional): Number of days of test data. Defaults to 7.
+
+    Returns:
+        pd.DataFrame: Execution time in seconds of each backend.
+    """
+    from src.data.features import compute_features
+    from src.data.split import get_train_test_set as get_train_test_set_pandas
+
+    split_kwargs = {"delta_train": delta_train, "delta_delay": delta_delay, "delta_test": delta_test}
+
+    # compute_features adds columns in place, so copy the frame outside of the timed section
+    pandas_tx_df = tx_df.copy()
+    start_time = time.time()
+    features_df = compute_features(pandas_tx_df, window_sizes=window_sizes, delay_period=delay_period)
+    get_train_test_set_pandas(features_df, start_date_training, **split_kwargs)
+    pandas_time = time.time() - start_time
+
+    start_time = time.time()
+    get_features_train_test_set(
+        tx_df, start_date_training, window_sizes=window_sizes, delay_period=delay_period, **split_kwargs
+    )
+    polars_time = time.time() - start_time
+
+    return pd.DataFrame({"backend": ["pandas", "polars"], "execution_time": [pandas_time, polars_time]}).set_index(
+        "backend"
+    )
@@ -0,0 +1,89 @@
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+
+def subsample_negatives(
+    train_df: pd.DataFrame,
+    sampling_rate: float,
+    output_feature: str = "tx_fraud",
+    stratify_by: str = None,
+    weight_feature: str = "sample_weight",
+    random_state: int = 0,
+) -> pd.DataFrame:
+    """Downsample genuine transactions while keeping all frauds.
+
+    Each stratum keeps `floor(n_stratum * sampling_rate)` genuine transactions plus one more with a probability equal
+    to the fractional part, so that small strata are kept at the sampling rate on average instead of being rounded
+    away. Kept genuine transactions get an importance weight of `n_stratum / n_sampled` (about `1 / sampling_rate`)
+    and frauds a weight of 1. Weighted genuine transactions thus sum up to the number of genuine transactions in each
+    sampled stratum, and weighted training on the reduced set approximates training on the full set.
+
+    Args:
+        train_df (pd.DataFrame): Training dataframe.
+        sampling_rate (float): Fraction of genuine transactions to keep, in (0, 1].
+        output_feature (str, optional): Name of the output feature. Defaults to "tx_fraud".
+        stratify_by (str, optional): Column to sample within, e.g., "customer_id" or "tx_time_days". Defaults to None,
+            which samples uniformly over all genuine transactions.
+        weight_feature (str, optional): Name of the importance weight column. Defaults to "sample_weight".
+        random_state (int, optional): Random state. Defaults to 0.
+
+    Raises:
+        ValueError: If the sampling rate is invalid.
+
+    Returns:
+        pd.DataFrame: Reduced training dataframe with importance weights, in original order.
+    """
+    if not 0 < sampling_rate <= 1:
+        raise ValueError(f"Sampling rate must be in (0, 1], but got {sampling_rate}.")
+
+    # work with row positions, so that duplicate index labels do not matter
+    negatives = np.flatnonzero(train_df[output_feature].to_numpy() == 0)
+
+    # assign genuine transactions to strata (e.g., per customer or per day)
+    if stratify_by is None:
+        strata = np.zeros(len(negatives), dtype=int)
+    else:
+        strata = pd.factorize(train_df[stratify_by].to_numpy()[negatives])[0]
+    nb_negatives = np.bincount(strata)
+
+    # randomized rounding of the sample size of each stratum
+    rng = np.random.default_rng(random_state)
+    expected_sampled = nb_negatives * sampling_rate
+    nb_sampled = np.floor(expected_sampled).astype(int)
+    nb_sampled += rng.random(len(nb_negatives)) < expected_sampled - nb_sampled
+
+    # shuffle within each stratum and keep the first nb_sampled transactions of each
+    order = np.lexsort((rng.random(len(negatives)), strata))
+    stratum_start = np.cumsum(nb_negatives) - nb_negatives
+    rank = np.arange(len(order)) - stratum_start[strata[order]]
+    sampled = order[rank < nb_sampled[strata[order]]]
+
+    weights = np.where(train_df[output_feature].to_numpy() == 0, 0.0, 1.0)
+    weights[negatives[sampled]] = (nb_negatives / np.maximum(nb_sampled, 1))[strata[sampled]]
+
+    # restore original order of transactions
+    keep = np.flatnonzero(weights > 0)
+    sampled_df = train_df.iloc[keep].copy()
+    sampled_df[weight_feature] = weights[keep]
+
+    return sampled_df
+
+
+def calibrate_predictions(
+    predictions: Union[np.ndarray, pd.Series], sampling_rate: float
+) -> Union[np.ndarray, pd.Series]:
+    """Correct fraud probabilities of a model trained on unweighted, negatively subsampled data.
+
+    Downsampling genuine transactions with rate `b` inflates the odds of fraud by `1 / b`. The original probability
+    is recovered by `p = b * p_s / (b * p_s - p_s + 1)`. Models trained with importance weights do not need this.
+
+    Args:
+        predictions (Union[np.ndarray, pd.Series]): Predicted fraud probabilities.
+        sampling_rate (float): Fraction of genuine transactions kept during training.
+
+    Returns:
+        Union[np.ndarray, pd.Series]: Calibrated fraud probabilities.
+    """
+    return sampling_rate * predictions / (sampling_rate * predictions - predictions + 1)
@@ -10,6 +10,7 @@ def get_train_test_set(
     delta_train: int = 7,
     delta_delay: int = 7,
     delta_test: int = 7,
+    backend: str = "pandas",
 ) -> Tuple[pd.DataFrame]:
     """Create train and test sets from the transaction data.
 
@@ -19,10 +20,24 @@ def get_train_test_set(
         delta_train (int, optional): Number of days of training data. Defaults to 7.
         delta_delay (int, optional): Delay period for identifying frauds. Defaults to 7.
         delta_test (int, optional): Number of days of test data. Defaults to 7.
+        backend (str, optional): Either "pandas" or "polars" (lazy, multi-threaded). Defaults to "pandas".
 
     Returns:
         Tuple[pd.DataFrame]: Training and test sets
     """
+    if backend == "polars":
+        import polars as pl
+
+        from src.data.polars_backend import get_train_test_set as get_train_test_set_polars
+
+        train, test = get_train_test_set_polars(
+            tx_df, start_date_training, delta_train=delta_train, delta_delay=delta_delay, delta_test=delta_test
+        )
+        train, test = pl.collect_all([train, test])
+        return train.to_pandas(), test.to_pandas()
+    if backend != "pandas":
+        raise ValueError(f"Unknown backend: {backend}")
+
     train_df = tx_df[
         (tx_df.tx_datetime >= start_date_training)
         & (tx_df.tx_datetime < start_date_training + datetime.timedelta(delta_train))
@@ -102,8 +102,13 @@ def card_precision_top_k_day(df_day: pd.DataFrame, top_k: int) -> Tuple[Sequence
         Tuple[Sequence[int], float]: List of compromised cards, card precision top k.
     """
     # take max of predictions and label tx_fraud for each customer
-    # sort by decreasing order of fraudulent prediction
-    df_day = df_day.groupby("customer_id").max().sort_values(by="predictions", ascending=False).reset_index(drop=False)
+    # sort by decreasing order of fraudulent prediction, cards with tied predictions by increasing customer ID
+    df_day = (
+        df_day.groupby("customer_id")
+        .max()
+        .sort_values(by="predictions", ascending=False, kind="mergesort")
+        .reset_index(drop=False)
+    )
 
     # get the top k most suspicious cards
     df_day_top_k = df_day.head(top_k)
@@ -1,9 +1,15 @@
 import time
+from pathlib import Path
 from typing import Sequence
 
 import pandas as pd
-from sklearn.base import BaseEstimator
+from sklearn.base import BaseEstimator, clone
+from sklearn.exceptions import NotFittedError
 from sklearn.preprocessing import MinMaxScaler
+from sklearn.utils.validation import check_is_fitted
+
+from src.data.sampling import calibrate_predictions, subsample_negatives
+from src.metrics import evaluate_predictions
 
 
 def fit_model(
@@ -13,6 +19,7 @@ def fit_model(
     input_features: Sequence[str],
     output_feature: str,
     scale: bool = True,
+    sample_weight: str = None,
 ) -> dict:
     """Fit a classifier and return predictions.
 
@@ -23,10 +30,14 @@ def fit_model(
         input_features (Sequence[str]): List of input features.
         output_feature (str): Output feature.
         scale (bool, optional): Whether to scale using min-max scaler. Defaults to True.
+        sample_weight (str, optional): Column with importance weights passed as `sample_weight` to the classifier.
+            Defaults to None.
 
     Returns:
         dict: Dictionary containing the classifier, predictions, training and prediction execution time.
     """
+    fit_params = {} if sample_weight is None else {"sample_weight": train_df[sample_weight]}
+
     if scale:
         # Scale data using min-max scaler
         scaler = MinMaxScaler()
@@ -34,7 +45,7 @@ def fit_model(
         test_df[input_features] = scaler.transform(test_df[input_features])
 
     start_time = time.time()
-    classifier.fit(train_df[input_features], train_df[output_feature])
+    classifier.fit(train_df[input_features], train_df[output_feature], **fit_params)
     training_time = time.time() - start_time
 
     start_time = time.time()
@@ -50,3 +61,219 @@ def fit_model(
         "training_execution_time": training_time,
         "prediction_execution_time": prediction_time,
     }
+
+
+def compare_sampling_rates(
+    classifier: BaseEstimator,
+    train_df: pd.DataFrame,
+    test_df: pd.DataFrame,
+    input_features: Sequence[str],
+    output_feature: str,
+    sampling_rates: Sequence[float],
+    top_k_list: Sequence[int],
+    stratify_by: str = None,
+    weighted: bool = True,
+    scale: bool = True,
+) -> pd.DataFrame:
+    """Compare training time and evaluation metrics of a classifier across negative sampling rates.
+
+    Args:
+        classifier (BaseEstimator): Classifier to fit, cloned for each sampling rate.
+        train_df (pd.DataFrame): Training dataframe.
+        test_df (pd.DataFrame): Test dataframe.
+        input_features (Sequence[str]): List of input features.
+        output_feature (str): Output feature.
+        sampling_rates (Sequence[float]): Fractions of genuine transactions to keep, e.g., [1.0, 0.1, 0.01].
+        top_k_list (Sequence[int]): Top k values to compute card precision@k.
+        stratify_by (str, optional): Column to sample within, e.g., "customer_id" or "tx_time_days". Defaults to None.
+        weighted (bool, optional): Whether to train with importance weights. If False, predictions are re-calibrated
+            instead. Defaults to True.
+        scale (bool, optional): Whether to scale using min-max scaler. Defaults to True.
+
+    Returns:
+        pd.DataFrame: One row per sampling rate with effective sampling rate, training set size, training time and
+            evaluation metrics.
+    """
+    report = []
+
+    for sampling_rate in sampling_rates:
+        sampled_df = subsample_negatives(
+            train_df, sampling_rate, output_feature=output_feature, stratify_by=stratify_by
+        )
+        predictions_df = test_df.copy()
+
+        results = fit_model(
+            clone(classifier),
+            sampled_df,
+            predictions_df,
+            input_features,
+            output_feature,
+            scale=scale,
+            sample_weight="sample_weight" if weighted else None,
+        )
+
+        # fraction of genuine transactions actually kept, which differs from the nominal rate due to randomized
+        # rounding per stratum
+        nb_negatives = (train_df[output_feature] == 0).sum()
+        effective_sampling_rate = (sampled_df[output_feature] == 0).sum() / max(nb_negatives, 1)
+
+        predictions = results["predictions_test"]
+        if not weighted:
+            predictions = calibrate_predictions(predictions, effective_sampling_rate)
+        predictions_df["predictions"] = predictions
+
+        report.append(
+            {
+                "sampling_rate": sampling_rate,
+                "effective_sampling_rate": effective_sampling_rate,
+                "nb_train_tx": len(sampled_df),
+                "training_execution_time": results["training_execution_time"],
+                **evaluate_predictions(predictions_df, output_feature, "predictions", top_k_list),
+            }
+        )
+
+    return pd.DataFrame(report)
+
+
+def fit_model_incremental(
+    classifier: BaseEstimator,
+    partitions: Sequence[Path],
+    test_df: pd.DataFrame,
+    input_features: Sequence[str],
+    output_feature: str,
+    scale: bool = True,
+    scaler: MinMaxScaler = None,
+    classes: Sequence[int] = (0, 1),
+    n_epochs: int = 1,
+) -> dict:
+    """Fit a classifier out-of-core by streaming daily partitions through `partial_fit`.
+
+    Only one partition is held in memory at a time. Partitions must contain the input features, e.g., the daily
+    feature partitions written by `03_data_preprocessing` (raw transaction partitions do not). To warm-start daily
+    retraining, pass the classifier and scaler returned by a previous call together with the partitions of the new
+    day(s) only. A given scaler is reused as is, so that the feature scale seen by the warm-started classifier stays
+    the same.
+
+    Args:
+        classifier (BaseEstimator): Classifier supporting `partial_fit`, e.g., `SGDClassifier`.
+        partitions (Sequence[Path]): Feature partition files, see `save_partitions` and `list_partitions`.
+        test_df (pd.DataFrame): Test dataframe.
+        input_features (Sequence[str]): List of input features.
+        output_feature (str): Output feature.
+        scale (bool, optional): Whether to scale using min-max scaler. Defaults to True.
+        scaler (MinMaxScaler, optional): Previously fitted scaler. Defaults to None, which fits a new scaler
+            incrementally with an additional pass over the partitions. Required to warm-start a fitted classifier.
+        classes (Sequence[int], optional): All classes of the output feature. Defaults to (0, 1).
+        n_epochs (int, optional): Number of passes over the partitions. Defaults to 1.
+
+    Raises:
+        TypeError: If the classifier does not support `partial_fit`.
+        ValueError: If a fitted classifier is passed for scaled training without the scaler it was trained with.
+
+    Returns:
+        dict: Dictionary containing the classifier, scaler, test predictions, training and prediction execution time.
+    """
+    if not hasattr(classifier, "partial_fit"):
+        raise TypeError(f"{type(classifier).__name__} does not support incremental training via partial_fit.")
+
+    if scale and scaler is None and _is_fitted(classifier):
+        # a scaler fitted on the new partitions only would change the feature scale seen by the existing weights
+        raise ValueError("Warm-starting a fitted classifier requires the scaler it was trained with.")
+
+    if scale and scaler is None:
+        # Fit min-max scaler incrementally, one partition at a time
+        scaler = MinMaxScaler()
+        for partition in partitions:
+            scaler.partial_fit(pd.read_pickle(partition)[input_features])
+
+    start_time = time.time()
+    for _ in range(n_epochs):
+        for partition in partitions:
+            partition_df = pd.read_pickle(partition)
+            features = partition_df[input_features]
+            if scale:
+                features = scaler.transform(features)
+            classifier.partial_fit(features, partition_df[output_feature], classes=classes)
+            del partition_df, features
+    training_time = time.time() - start_time
+
+    test_features = test_df[input_features]
+    if scale:
+        test_features = scaler.transform(test_features)
+
+    start_time = time.time()
+    predictions_test = classifier.predict_proba(test_features)[:, 1]
+    prediction_time = time.time() - start_time
+
+    return {
+        "classifier": classifier,
+        "scaler": scaler,
+        "predictions_test": predictions_test,
+        "training_execution_time": training_time,
+        "prediction_execution_time": prediction_time,
+    }
+
+
+def compare_incremental_to_full_batch(
+    classifier: BaseEstimator,
+    partitions: Sequence[Path],
+    test_df: pd.DataFrame,
+    input_features: Sequence[str],
+    output_feature: str,
+    top_k_list: Sequence[int],
+    scale: bool = True,
+    n_epochs: int = 1,
+) -> pd.DataFrame:
+    """Compare training time and evaluation metrics of incremental and full-batch training on the same partitions.
+
+    Args:
+        classifier (BaseEstimator): Classifier supporting `partial_fit`, cloned for each training mode.
+        partitions (Sequence[Path]): Feature partition files, see `save_partitions` and `list_partitions`.
+        test_df (pd.DataFrame): Test dataframe.
+        input_features (Sequence[str]): List of input features.
+        output_feature (str): Output feature.
+        top_k_list (Sequence[int]): Top k values to compute card precision@k.
+        scale (bool, optional): Whether to scale using min-max scaler. Defaults to True.
+        n_epochs (int, optional): Number of passes over the partitions for incremental training. Defaults to 1.
+
+    Returns:
+        pd.DataFrame: One row per training mode with training time and evaluation metrics.
+    """
+    report = {}
+
+    # full-batch training loads all partitions into memory at once
+    train_df = pd.concat([pd.read_pickle(partition) for partition in partitions], ignore_index=True)
+    predictions_df = test_df.copy()
+    results = fit_model(clone(classifier), train_df, predictions_df, input_features, output_feature, scale=scale)
+    del train_df
+    predictions_df["predictions"] = results["predictions_test"]
+    report["full_batch"] = {
+        "training_execution_time": results["training_execution_time"],
+        **evaluate_predictions(predictions_df, output_feature, "predictions", top_k_list),
+    }
+
+    predictions_df = test_df.copy()
+    results = fit_model_incremental(
+        clone(classifier),
+        partitions,
+        predictions_df,
+        input_features,
+        output_feature,
+        scale=scale,
+        n_epochs=n_epochs,
+    )
+    predictions_df["predictions"] = results["predictions_test"]
+    report["incremental"] = {
+        "training_execution_time": results["training_execution_time"],
+        **evaluate_predictions(predictions_df, output_feature, "predictions", top_k_list),
+    }
+
+    return pd.DataFrame(report).T
+
+
+def _is_fitted(estimator: BaseEstimator) -> bool:
+    try:
+        check_is_fitted(estimator)
+    except NotFittedError:
+        return False
+    return True
@@ -0,0 +1,302 @@
+import json
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class QuantileSketch:
+    """Mergeable streaming quantile sketch with relative accuracy guarantees (DDSketch).
+
+    Values are counted in logarithmically sized buckets, so memory grows with the logarithm of the value range and
+    not with the number of values. Sketches with the same relative accuracy share the bucket grid, which makes
+    merging and comparing them exact.
+
+    Args:
+        relative_accuracy (float, optional): Maximum relative error of quantile estimates. Defaults to 0.01.
+    """
+
+    # values with smaller magnitude are counted as zero
+    min_value = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.positive: Counter = Counter()
+        self.negative: Counter = Counter()
+        self.zero_count = 0
+
+    @property
+    def count(self) -> int:
+        """Number of values added to the sketch."""
+        return sum(self.positive.values()) + sum(self.negative.values()) + self.zero_count
+
+    def update(self, values: np.ndarray) -> None:
+        """Adds a batch of values, ignoring missing values.
+
+        Args:
+            values (np.ndarray): Values to add.
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+
+        is_zero = np.abs(values) < self.min_value
+        self.zero_count += int(is_zero.sum())
+
+        for store, magnitudes in [
+            (self.positive, values[values >= self.min_value]),
+            (self.negative, -values[values <= -self.min_value]),
+        ]:
+            keys, counts = np.unique(self._key(magnitudes), return_counts=True)
+            store.update(dict(zip(keys.tolist(), counts.tolist())))
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Merges another sketch into this one.
+
+        Args:
+            other (QuantileSketch): Sketch with the same relative accuracy.
+
+        Returns:
+            QuantileSketch: This sketch.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same relative accuracy can be merged.")
+        self.positive.update(other.positive)
+        self.negative.update(other.negative)
+        self.zero_count += other.zero_count
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Estimates the given quantile.
+
+        Args:
+            q (float): Quantile in [0, 1].
+
+        Returns:
+            float: Estimated quantile, NaN if the sketch is empty.
+        """
+        keys, counts = self.histogram()
+        if len(counts) == 0:
+            return np.nan
+        rank = q * (counts.sum() - 1)
+        return self._value(keys[np.searchsorted(np.cumsum(counts), rank, side="right")])
+
+    def histogram(self) -> Tuple[List[Tuple[int, int]], np.ndarray]:
+        """Returns the non-empty buckets in increasing order of values.
+
+        Returns:
+            Tuple[List[Tuple[int, int]], np.ndarray]: Bucket keys as (sign, index) and counts.
+        """
+        buckets = {(-1, -k): c for k, c in self.negative.items()}
+        if self.zero_count > 0:
+            buckets[(0, 0)] = self.zero_count
+        buckets.update({(1, k): c for k, c in self.positive.items()})
+        keys = sorted(buckets)
+        return keys, np.array([buckets[key] for key in keys], dtype=float)
+
+    def to_dict(self) -> dict:
+        """Serializes the sketch.
+
+        Returns:
+            dict: JSON-serializable sketch.
+        """
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "positive": {str(k): c for k, c in self.positive.items()},
+            "negative": {str(k): c for k, c in self.negative.items()},
+            "zero_count": self.zero_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        """Deserializes a sketch.
+
+        Args:
+            data (dict): Sketch serialized by `to_dict`.
+
+        Returns:
+            QuantileSketch: Sketch.
+        """
+        sketch = cls(data["relative_accuracy"])
+        sketch.positive.update({int(k): c for k, c in data["positive"].items()})
+        sketch.negative.update({int(k): c for k, c in data["negative"].items()})
+        sketch.zero_count = data["zero_count"]
+        return sketch
+
+    def _key(self, magnitudes: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(magnitudes) / np.log(self.gamma)).astype(int)
+
+    def _value(self, key: Tuple[int, int]) -> float:
+        sign, k = key
+        if sign == 0:
+            return 0.0
+        return sign * 2 * self.gamma ** (sign * k) / (self.gamma + 1)
+
+
+def population_stability_index(
+    reference: QuantileSketch, current: QuantileSketch, n_bins: int = 10, eps: float = 1e-4
+) -> float:
+    """Calculates the population stability index (PSI) between two sketches.
+
+    Bins are chosen as quantiles of the reference distribution, aligned to the shared bucket grid.
+
+    Args:
+        reference (QuantileSketch): Sketch of the reference period.
+        current (QuantileSketch): Sketch of the current period.
+        n_bins (int, optional): Number of bins. Defaults to 10.
+        eps (float, optional): Minimum bin probability to avoid division by zero. Defaults to 1e-4.
+
+    Returns:
+        float: Population stability index.
+    """
+    p, q = _aligned_probabilities(reference, current)
+
+    # assign buckets to reference quantile bins
+    bins = np.minimum(np.floor((np.cumsum(p) - p) * n_bins), n_bins - 1).astype(int)
+    p = np.maximum(np.bincount(bins, weights=p, minlength=n_bins), eps)
+    q = np.maximum(np.bincount(bins, weights=q, minlength=n_bins), eps)
+
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def kolmogorov_smirnov_statistic(reference: QuantileSketch, current: QuantileSketch) -> float:
+    """Calculates the Kolmogorov-Smirnov statistic between two sketches, up to the bucket resolution.
+
+    Args:
+        reference (QuantileSketch): Sketch of the reference period.
+        current (QuantileSketch): Sketch of the current period.
+
+    Returns:
+        float: Maximum absolute difference of the cumulative distributions.
+    """
+    p, q = _aligned_probabilities(reference, current)
+    return float(np.max(np.abs(np.cumsum(p) - np.cumsum(q))))
+
+
+def _aligned_probabilities(reference: QuantileSketch, current: QuantileSketch) -> Tuple[np.ndarray, np.ndarray]:
+    reference_keys, reference_counts = reference.histogram()
+    current_keys, current_counts = current.histogram()
+    if reference_counts.sum() == 0 or current_counts.sum() == 0:
+        raise ValueError("Cannot compare empty sketches.")
+
+    keys = sorted(set(reference_keys).union(current_keys))
+    positions = {key: i for i, key in enumerate(keys)}
+    p, q = np.zeros(len(keys)), np.zeros(len(keys))
+    p[[positions[key] for key in reference_keys]] = reference_counts / reference_counts.sum()
+    q[[positions[key] for key in current_keys]] = current_counts / current_counts.sum()
+
+    return p, q
+
+
+class DriftMonitor:
+    """Monitors feature and score distributions with daily sketch snapshots.
+
+    Args:
+        features (Sequence[str]): Features to monitor, e.g., input features from `mvp/config.yaml` and predictions.
+        relative_accuracy (float, optional): Relative accuracy of the sketches. Defaults to 0.01.
+    """
+
+    def __init__(self, features: Sequence[str], relative_accuracy: float = 0.01):
+        self.features = list(features)
+        self.relative_accuracy = relative_accuracy
+        self.snapshots: Dict[int, Dict[str, QuantileSketch]] = defaultdict(self._empty_snapshot)
+
+    def update(self, tx_df: pd.DataFrame) -> None:
+        """Updates the daily snapshots with a partition or batch of transactions.
+
+        Args:
+            tx_df (pd.DataFrame): Transactions with tx_time_days and (a subset of) the monitored features.
+        """
+        for day, df_day in tx_df.groupby("tx_time_days"):
+            for feature in self.features:
+                if feature in df_day.columns:
+                    self.snapshots[int(day)][feature].update(df_day[feature].to_numpy(dtype=float))
+
+    def get_period(self, start_day: int, end_day: int) -> Dict[str, QuantileSketch]:
+        """Merges the daily snapshots of a period.
+
+        Args:
+            start_day (int): First day of the period.
+            end_day (int): Last day of the period (inclusive).
+
+        Returns:
+            Dict[str, QuantileSketch]: Merged sketch per feature.
+        """
+        period = self._empty_snapshot()
+        for day, snapshot in self.snapshots.items():
+            if start_day <= day <= end_day:
+                for feature, sketch in snapshot.items():
+                    period[feature].merge(sketch)
+        return period
+
+    def drift(
+        self, reference_period: Tuple[int, int], current_period: Tuple[int, int], n_bins: int = 10
+    ) -> pd.DataFrame:
+        """Compares the feature distributions of two periods without rereading raw data.
+
+        Args:
+            reference_period (Tuple[int, int]): First and last day of the reference period.
+            current_period (Tuple[int, int]): First and last day of the current period.
+            n_bins (int, optional): Number of bins for the population stability index. Defaults to 10.
+
+        Returns:
+            pd.DataFrame: Population stability index and Kolmogorov-Smirnov statistic per feature.
+        """
+        reference = self.get_period(*reference_period)
+        current = self.get_period(*current_period)
+
+        results = []
+        for feature in self.features:
+            if reference[feature].count == 0 or current[feature].count == 0:
+                continue
+            results.append(
+                {
+                    "feature": feature,
+                    "psi": population_stability_index(reference[feature], current[feature], n_bins=n_bins),
+                    "ks": kolmogorov_smirnov_statistic(reference[feature], current[feature]),
+                }
+            )
+
+        return pd.DataFrame(results, columns=["feature", "psi", "ks"]).set_index("feature")
+
+    def save(self, path: Path) -> None:
+        """Saves the daily snapshots to a JSON file.
+
+        Args:
+            path (Path): Path to JSON file.
+        """
+        data = {
+            "features": self.features,
+            "relative_accuracy": self.relative_accuracy,
+            "snapshots": {
+                str(day): {feature: sketch.to_dict() for feature, sketch in snapshot.items()}
+                for day, snapshot in self.snapshots.items()
+            },
+        }
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path: Path) -> "DriftMonitor":
+        """Loads daily snapshots from a JSON file.
+
+        Args:
+            path (Path): Path to JSON file.
+
+        Returns:
+            DriftMonitor: Drift monitor with the loaded snapshots.
+        """
+        with open(path) as f:
+            data = json.load(f)
+
+        monitor = cls(data["features"], relative_accuracy=data["relative_accuracy"])
+        for day, snapshot in data["snapshots"].items():
+            monitor.snapshots[int(day)] = {
+                feature: QuantileSketch.from_dict(sketch) for feature, sketch in snapshot.items()
+            }
+        return monitor
+
+    def _empty_snapshot(self) -> Dict[str, QuantileSketch]:
+        return {feature: QuantileSketch(self.relative_accuracy) for feature in self.features}
@@ -1,3 +1,7 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
 import pytest
 
 from src.data.generator import (
@@ -6,6 +10,7 @@ from src.data.generator import (
     generate_dataset,
     generate_terminal_profiles_table,
     generate_transactions_table,
+    get_fraud_overlay,
     get_list_terminals_within_radius,
 )
 
@@ -114,3 +119,52 @@ def test_add_frauds(dataset_with_frauds):
     assert len(tx_df) > 0
     assert all(col in tx_df.columns for col in ["tx_fraud", "tx_fraud_scenario"])
     assert tx_df.tx_fraud.sum() > 0, f"Number of frauds expected > 0, but got {tx_df.tx_fraud.sum()}"
+
+
+def test_get_fraud_overlay(dataset):
+    cust_df, term_df, tx_df = dataset
+    base_df = tx_df.copy()
+    params = {"num_compomised_terminals_per_day": 1, "compromised_terminal_duration": 2}
+
+    overlay = get_fraud_overlay(cust_df, term_df, base_df, **params)
+    pd.testing.assert_frame_equal(base_df, tx_df)
+    assert overlay.nbytes < base_df.memory_usage().sum()
+
+    view_df = overlay.materialize(base_df)
+    pd.testing.assert_frame_equal(view_df, add_frauds(cust_df, term_df, tx_df.copy(), **params))
+    pd.testing.assert_frame_equal(base_df, tx_df)
+
+
+def test_add_frauds_pinned():
+    # expected values of the original, table-scanning implementation of add_frauds for this seeded dataset
+    cust_df, term_df, tx_df = generate_dataset(
+        n_customers=200, n_terminals=500, nb_days=30, start_date="2018-04-01", r=10
+    )
+
+    overlay = get_fraud_overlay(cust_df, term_df, tx_df)
+    assert overlay.nb_frauds_per_scenario == (5, 528, 621)
+
+    tx_df = add_frauds(cust_df, term_df, tx_df)
+    assert len(tx_df) == 11375
+    assert tx_df.tx_fraud_scenario.value_counts().sort_index().to_dict() == {0: 10221, 1: 4, 2: 493, 3: 657}
+    assert (
+        hashlib.sha256(tx_df.tx_fraud_scenario.to_numpy(dtype=np.int8).tobytes()).hexdigest()
+        == "916fca4518e506d4ea7006f1c2e228bbcc627c24d1137d583d6200b3c7aa163b"
+    )
+    assert (
+        hashlib.sha256(np.round(tx_df.tx_amount.to_numpy(dtype=float), 2).tobytes()).hexdigest()
+        == "e896f65ecbae0e3c8726edcca87b390087dc15fc5e556e57331248812886eae5"
+    )
+
+    # scenario 3 samples compromised transactions in table order
+    _, _, tx_df = generate_dataset(n_customers=200, n_terminals=500, nb_days=30, start_date="2018-04-01", r=10)
+    tx_df = add_frauds(cust_df, term_df, tx_df.sample(frac=1, random_state=0)).sort_index()
+    assert tx_df.tx_fraud_scenario.value_counts().sort_index().to_dict() == {0: 10220, 1: 4, 2: 491, 3: 660}
+    assert (
+        hashlib.sha256(tx_df.tx_fraud_scenario.to_numpy(dtype=np.int8).tobytes()).hexdigest()
+        == "f165ea29d2a52074f339fa292ed9dcec6cadc760afa09fb53f5819b27a6d10c2"
+    )
+    assert (
+        hashlib.sha256(np.round(tx_df.tx_amount.to_numpy(dtype=float), 2).tobytes()).hexdigest()
+        == "fc1b41f9cd510f078df681e2abdd13ca678965d11c1a6d20b21414d57890cdac"
+    )
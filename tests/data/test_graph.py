@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from src.data.graph import build_incidence_matrix, get_customer_terminal_risk_features
+
+
+def test_build_incidence_matrix():
+    incidence = build_incidence_matrix(np.array([0, 0, 1]), np.array([5, 5, 2]), n_customers=2, n_terminals=1000000)
+    assert incidence.shape == (2, 1000000)
+    assert incidence.nnz == 2
+    assert incidence[0, 5] == 2
+    assert incidence[1, 2] == 1
+
+
+def test_get_customer_terminal_risk_features():
+    tx_df = pd.DataFrame(
+        {
+            "customer_id": [0, 1, 0, 0],
+            "terminal_id": [0, 1, 1, 0],
+            "tx_time_days": [0, 0, 1, 2],
+            "tx_fraud": [0, 1, 0, 0],
+        }
+    )
+    features_df = get_customer_terminal_risk_features(tx_df, delay_period=1, window_sizes=[1, 2])
+
+    # day 2: customer 0 visited terminal 1 on day 1, which had a known fraud rate of 1 on day 0
+    assert list(features_df.customer_id_terminal_risk_1_day_window) == [0, 0, 0, 1]
+    # day 2: customer 0 visited terminals 0 (risk 0) and 1 (risk 1) on days 0 and 1
+    assert list(features_df.customer_id_terminal_risk_2_day_window) == [0, 0, 0, 0.5]
+    assert "customer_id_terminal_risk_1_day_window" not in tx_df.columns
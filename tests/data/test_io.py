@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from src.data.io import iter_dataframes, list_partitions, load_dataframes, save_partitions
+
+
+@pytest.fixture
+def partition_dir(tmp_path):
+    for day, date in enumerate(["2018-04-01", "2018-04-02", "2018-04-03"]):
+        pd.DataFrame({"transaction_id": [2 * day, 2 * day + 1], "tx_time_days": [day, day]}).to_pickle(
+            tmp_path / f"{date}.pkl"
+        )
+    return tmp_path
+
+
+def test_list_partitions(partition_dir):
+    assert [f.stem for f in list_partitions(partition_dir)] == ["2018-04-01", "2018-04-02", "2018-04-03"]
+    assert [f.stem for f in list_partitions(partition_dir, start_date="2018-04-02")] == ["2018-04-02", "2018-04-03"]
+    assert [f.stem for f in list_partitions(partition_dir, end_date="2018-04-01")] == ["2018-04-01"]
+
+
+def test_iter_dataframes(partition_dir):
+    partitions = list(iter_dataframes(partition_dir, start_date="2018-04-02"))
+    assert len(partitions) == 2
+    assert all(len(df) == 2 for df in partitions)
+
+
+def test_load_dataframes(partition_dir):
+    tx_df = load_dataframes(partition_dir, sort_by="transaction_id")
+    assert list(tx_df.transaction_id) == list(range(6))
+
+
+def test_save_partitions(tmp_path):
+    tx_df = pd.DataFrame(
+        {
+            "transaction_id": [0, 1, 2, 3],
+            "tx_datetime": pd.to_datetime(
+                ["2018-04-02 10:00", "2018-04-01 23:59", "2018-04-02 00:00", "2018-04-04 12:00"]
+            ),
+        }
+    )
+    files = save_partitions(tx_df, tmp_path / "features")
+    assert files == list_partitions(tmp_path / "features")
+    assert [f.stem for f in files] == ["2018-04-01", "2018-04-02", "2018-04-04"]
+    assert list(load_dataframes(tmp_path / "features").transaction_id) == [1, 2, 0, 3]
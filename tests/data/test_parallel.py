@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from src.data.features import compute_features, is_night, is_weekend
+from src.data.generator import add_frauds, generate_dataset
+from src.data.parallel import benchmark_parallel, get_entity_features_parallel
+
+
+@pytest.fixture(scope="module")
+def tx_df():
+    cust_df, term_df, tx_df = generate_dataset(
+        n_customers=20, n_terminals=20, nb_days=20, start_date="2018-04-01", r=30
+    )
+    return add_frauds(cust_df, term_df, tx_df, num_compomised_terminals_per_day=1, compromised_terminal_duration=3)
+
+
+def test_get_entity_features_parallel(tx_df):
+    shuffled_df = tx_df.sample(frac=1, random_state=0)
+    features_df = get_entity_features_parallel(shuffled_df, window_sizes=[1, 7], delay_period=3, n_workers=2)
+
+    # results are stitched back in original row order
+    assert list(features_df.transaction_id) == list(shuffled_df.transaction_id)
+    assert list(features_df.index) == list(shuffled_df.index)
+
+
+def test_compute_features_parallel(tx_df):
+    expected_df = compute_features(tx_df.copy(), window_sizes=[1, 7], delay_period=3)
+    features_df = compute_features(tx_df.copy(), window_sizes=[1, 7], delay_period=3, backend="parallel")
+    pd.testing.assert_frame_equal(
+        expected_df.sort_values("transaction_id").reset_index(drop=True),
+        features_df[expected_df.columns].sort_values("transaction_id").reset_index(drop=True),
+        check_dtype=False,
+    )
+    # vectorized datetime features match the scalar helpers
+    assert list(features_df.tx_during_weekend) == list(features_df.tx_datetime.apply(is_weekend))
+    assert list(features_df.tx_during_night) == list(features_df.tx_datetime.apply(is_night))
+
+
+def test_benchmark_parallel(tx_df):
+    timings = benchmark_parallel(tx_df, n_workers_list=[1, 2], window_sizes=[1, 7], delay_period=3)
+    assert list(timings.index) == [1, 2]
+    assert all(timings.execution_time > 0)
+    assert all(timings.speedup > 0)
@@ -0,0 +1,81 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from src.data.features import compute_features
+from src.data.generator import add_frauds, generate_dataset
+from src.data.split import get_train_test_set
+
+pytest.importorskip("polars")
+
+from src.data.polars_backend import benchmark_backends, get_features_train_test_set  # noqa: E402
+
+START_DATE_TRAINING = datetime.datetime(2018, 4, 8)
+
+
+@pytest.fixture(scope="module")
+def tx_df():
+    cust_df, term_df, tx_df = generate_dataset(
+        n_customers=20, n_terminals=10, nb_days=30, start_date="2018-04-01", r=50
+    )
+    return add_frauds(cust_df, term_df, tx_df, num_compromised_customers_per_day=1, compromised_customer_duration=3)
+
+
+@pytest.fixture(scope="module")
+def features_df(tx_df):
+    return compute_features(tx_df.copy(), window_sizes=[1, 7], delay_period=3)
+
+
+def test_compute_features_polars(tx_df, features_df):
+    polars_df = compute_features(tx_df.copy(), window_sizes=[1, 7], delay_period=3, backend="polars")
+    pd.testing.assert_frame_equal(
+        features_df.sort_values("transaction_id").reset_index(drop=True),
+        polars_df[features_df.columns].sort_values("transaction_id").reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_get_train_test_set_polars(features_df):
+    for pandas_df, polars_df in zip(
+        get_train_test_set(features_df, START_DATE_TRAINING, delta_train=5, delta_delay=3, delta_test=5),
+        get_train_test_set(
+            features_df, START_DATE_TRAINING, delta_train=5, delta_delay=3, delta_test=5, backend="polars"
+        ),
+    ):
+        assert len(pandas_df) > 0
+        pd.testing.assert_frame_equal(
+            pandas_df.reset_index(drop=True), polars_df.reset_index(drop=True), check_dtype=False
+        )
+
+
+def test_get_train_test_set_polars_empty_training_period(features_df):
+    start_date_training = datetime.datetime(2019, 1, 1)
+    for pandas_df, polars_df in zip(
+        get_train_test_set(features_df, start_date_training),
+        get_train_test_set(features_df, start_date_training, backend="polars"),
+    ):
+        assert len(pandas_df) == len(polars_df) == 0
+        assert list(polars_df.columns) == list(pandas_df.columns)
+
+
+def test_get_features_train_test_set(tx_df, features_df):
+    train_df, test_df = get_features_train_test_set(
+        tx_df, START_DATE_TRAINING, window_sizes=[1, 7], delay_period=3, delta_train=5, delta_delay=3, delta_test=5
+    )
+    expected_train_df, expected_test_df = get_train_test_set(
+        features_df, START_DATE_TRAINING, delta_train=5, delta_delay=3, delta_test=5
+    )
+    assert list(train_df.transaction_id) == list(expected_train_df.transaction_id)
+    assert list(test_df.transaction_id) == list(expected_test_df.transaction_id)
+
+
+def test_benchmark_backends(tx_df):
+    timings = benchmark_backends(tx_df, START_DATE_TRAINING, window_sizes=[1, 7], delay_period=3, delta_train=5)
+    assert list(timings.index) == ["pandas", "polars"]
+    assert all(timings.execution_time > 0)
+
+
+def test_unknown_backend(tx_df):
+    with pytest.raises(ValueError):
+        compute_features(tx_df.copy(), backend="dask")
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.sampling import calibrate_predictions, subsample_negatives
+
+
+@pytest.fixture
+def train_df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "customer_id": rng.integers(0, 10, 2000),
+            "tx_time_days": rng.integers(0, 7, 2000),
+            "tx_fraud": (rng.uniform(0, 1, 2000) < 0.02).astype(int),
+        }
+    )
+
+
+def test_subsample_negatives(train_df):
+    sampled_df = subsample_negatives(train_df, 0.1)
+    assert sampled_df.tx_fraud.sum() == train_df.tx_fraud.sum()
+    assert (sampled_df.tx_fraud == 0).sum() - (train_df.tx_fraud == 0).sum() * 0.1 == pytest.approx(0, abs=1)
+    assert sampled_df.index.is_monotonic_increasing
+    assert np.allclose(sampled_df.loc[sampled_df.tx_fraud == 0, "sample_weight"], 10, rtol=0.01)
+    assert all(sampled_df.loc[sampled_df.tx_fraud == 1, "sample_weight"] == 1)
+    # weights restore the number of genuine transactions
+    assert sampled_df.sample_weight.sum() == pytest.approx(len(train_df))
+
+
+def test_subsample_negatives_stratified(train_df):
+    sampled_df = subsample_negatives(train_df, 0.5, stratify_by="customer_id")
+    negatives_per_customer = train_df[train_df.tx_fraud == 0].customer_id.value_counts()
+    sampled_per_customer = sampled_df[sampled_df.tx_fraud == 0].customer_id.value_counts()
+    assert (sampled_per_customer - (negatives_per_customer * 0.5)).abs().max() <= 1
+
+
+@pytest.fixture
+def large_train_df():
+    rng = np.random.default_rng(1)
+    n = 70000
+    return pd.DataFrame(
+        {
+            "customer_id": rng.integers(0, 5000, n),
+            "tx_time_days": rng.integers(0, 7, n),
+            "tx_fraud": (rng.uniform(0, 1, n) < 0.005).astype(int),
+        }
+    )
+
+
+def test_subsample_negatives_many_small_strata(large_train_df):
+    nb_negatives = (large_train_df.tx_fraud == 0).sum()
+    negatives_per_customer = large_train_df[large_train_df.tx_fraud == 0].customer_id.value_counts()
+
+    # customers have about 14 genuine transactions, so rounding to the nearest integer would empty many samples
+    for sampling_rate in [0.25, 0.05, 0.01]:
+        sampled_df = subsample_negatives(large_train_df, sampling_rate, stratify_by="customer_id")
+        sampled_negatives = sampled_df[sampled_df.tx_fraud == 0]
+        sampled_per_customer = sampled_negatives.customer_id.value_counts()
+
+        # randomized rounding keeps floor(n * rate) or one more genuine transactions per customer
+        difference = sampled_per_customer.reindex(negatives_per_customer.index, fill_value=0) - np.floor(
+            negatives_per_customer * sampling_rate
+        )
+        assert difference.isin([0, 1]).all()
+        assert len(sampled_negatives) == pytest.approx(nb_negatives * sampling_rate, rel=0.05)
+        # weights restore the number of genuine transactions of each sampled customer
+        pd.testing.assert_series_equal(
+            sampled_negatives.groupby("customer_id").sample_weight.sum().sort_index(),
+            negatives_per_customer[sampled_per_customer.index].sort_index().astype(float),
+            check_names=False,
+        )
+
+    sampled_df = subsample_negatives(large_train_df, 0.01, stratify_by="tx_time_days")
+    assert (sampled_df.tx_fraud == 0).sum() == pytest.approx(nb_negatives * 0.01, abs=7)
+    assert sampled_df.sample_weight.sum() == pytest.approx(len(large_train_df))
+
+
+def test_subsample_negatives_duplicate_index(large_train_df):
+    partitions_df = pd.concat([large_train_df.iloc[:35000], large_train_df.iloc[35000:]])
+    partitions_df.index = np.concatenate([np.arange(35000), np.arange(35000)])
+
+    sampled_df = subsample_negatives(partitions_df, 0.1)
+    assert (sampled_df.tx_fraud == 0).sum() - (partitions_df.tx_fraud == 0).sum() * 0.1 == pytest.approx(0, abs=1)
+    assert sampled_df.tx_fraud.sum() == partitions_df.tx_fraud.sum()
+
+
+def test_subsample_negatives_invalid_rate(train_df):
+    with pytest.raises(ValueError):
+        subsample_negatives(train_df, 0)
+
+
+def test_calibrate_predictions():
+    predictions = np.array([0.0, 0.5, 1.0])
+    np.testing.assert_allclose(calibrate_predictions(predictions, 0.1), [0.0, 0.1 / 1.1, 1.0])
+    np.testing.assert_allclose(calibrate_predictions(predictions, 1.0), predictions)
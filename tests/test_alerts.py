@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.alerts import TopKAlertQueue, replay_predictions
+from src.metrics import card_precision_top_k, card_precision_top_k_day
+
+
+@pytest.fixture
+def predictions_df():
+    rng = np.random.default_rng(0)
+    n = 5000
+    tx_time_seconds = np.sort(rng.integers(0, 10 * 86400, n))
+    tx_fraud = (rng.uniform(0, 1, n) < 0.05).astype(int)
+    return pd.DataFrame(
+        {
+            "tx_datetime": pd.to_datetime(tx_time_seconds, unit="s", origin="2018-04-01"),
+            "tx_time_days": tx_time_seconds // 86400,
+            "customer_id": rng.integers(0, 300, n),
+            "tx_fraud": tx_fraud,
+            "predictions": rng.uniform(0, 1, n) * (1 + tx_fraud) / 2,
+        }
+    )
+
+
+def test_top_k_alert_queue():
+    alert_queue = TopKAlertQueue(top_k=2)
+    for customer_id, score in [(1, 0.1), (2, 0.5), (3, 0.3), (1, 0.9), (2, 0.2), (4, 0.4)]:
+        alert_queue.update(customer_id, score)
+    assert alert_queue.queue() == [(1, 0.9), (2, 0.5)]
+
+    alert_queue.exclude(1)
+    assert alert_queue.queue() == [(2, 0.5)]
+
+    assert alert_queue.roll_over(compromised_cards=[2, 3]) == [(2, 0.5)]
+    assert alert_queue.queue() == []
+
+    # card 2 was detected as compromised, card 3 was not in the queue
+    for customer_id, score in [(1, 0.9), (2, 0.8), (3, 0.7)]:
+        alert_queue.update(customer_id, score)
+    assert alert_queue.queue() == [(3, 0.7)]
+
+
+def test_top_k_alert_queue_matches_card_precision_top_k_day(predictions_df):
+    df_day = predictions_df[predictions_df.tx_time_days == 0]
+    alert_queue = TopKAlertQueue(top_k=20)
+    for customer_id, score in zip(df_day.customer_id, df_day.predictions):
+        alert_queue.update(customer_id, score)
+
+    expected = df_day.groupby("customer_id").predictions.max().sort_values(ascending=False).head(20)
+    assert [customer_id for customer_id, _ in alert_queue.queue()] == list(expected.index)
+
+    detected_compromised_cards, _ = card_precision_top_k_day(df_day, 20)
+    compromised_cards = set(df_day[df_day.tx_fraud == 1].customer_id)
+    assert [c for c, _ in alert_queue.roll_over(compromised_cards) if c in compromised_cards] == list(
+        detected_compromised_cards
+    )
+
+
+def test_replay_predictions(predictions_df):
+    _, card_precision_top_k_per_day, _ = card_precision_top_k(predictions_df, 20)
+    _, replayed_card_precision_top_k_per_day = replay_predictions(predictions_df, 20)
+    assert replayed_card_precision_top_k_per_day == card_precision_top_k_per_day
+
+
+def test_replay_predictions_with_tied_scores(predictions_df):
+    # coarse scores, so that many cards are tied at the top k boundary
+    predictions_df = predictions_df.assign(predictions=(predictions_df.predictions * 4).round() / 4)
+    _, card_precision_top_k_per_day, _ = card_precision_top_k(predictions_df, 20)
+    _, replayed_card_precision_top_k_per_day = replay_predictions(predictions_df, 20)
+    assert replayed_card_precision_top_k_per_day == card_precision_top_k_per_day
+
+    df_day = predictions_df[predictions_df.tx_time_days == 0]
+    detected_compromised_cards, _ = card_precision_top_k_day(df_day, 20)
+    replayed_detected_compromised_cards_per_day, _ = replay_predictions(df_day, 20)
+    assert replayed_detected_compromised_cards_per_day[0] == detected_compromised_cards
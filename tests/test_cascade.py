@@ -0,0 +1,168 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.tree import DecisionTreeClassifier
+
+from src.cascade import CascadeScorer, EntityFeatures, compare_cascade
+from src.data.features import compute_features
+from src.data.generator import add_frauds, generate_dataset
+from src.utils import load_config
+
+RULES = [{"feature": "tx_amount", "operator": ">", "threshold": 220, "score": 1.0}]
+
+
+def make_transactions(n: int, random_state: int) -> pd.DataFrame:
+    rng = np.random.default_rng(random_state)
+    tx_amount = rng.uniform(0, 250, n)
+    risk = rng.uniform(0, 1, n)
+    tx_fraud = ((tx_amount > 220) | ((tx_amount > 150) & (risk > 0.7))).astype(int)
+    return pd.DataFrame(
+        {
+            "tx_amount": tx_amount,
+            "risk": risk,
+            "customer_id": rng.integers(0, 500, n),
+            "tx_time_days": rng.integers(0, 3, n),
+            "tx_fraud": tx_fraud,
+        }
+    )
+
+
+@pytest.fixture
+def cascade():
+    return CascadeScorer(
+        DecisionTreeClassifier(max_depth=4, random_state=0),
+        ["tx_amount", "risk"],
+        rules=RULES,
+        first_stage=DecisionTreeClassifier(max_depth=2, random_state=0),
+        first_stage_features=["tx_amount"],
+    ).fit(make_transactions(5000, random_state=0), "tx_fraud")
+
+
+def test_cascade_scorer(cascade):
+    test_df = make_transactions(2000, random_state=1)
+    uncertain_sizes = []
+
+    def compute_features(context_df, rows):
+        uncertain_sizes.append(len(rows))
+        return context_df.iloc[rows]
+
+    cascade.compute_features = compute_features
+    predictions, report = cascade.predict(test_df)
+
+    assert not np.isnan(predictions).any()
+    assert all(predictions[test_df.tx_amount > 220] == 1.0)
+    assert report.nb_tx.sum() == len(test_df)
+    assert report.fraction_resolved.sum() == pytest.approx(1)
+    assert report.loc["first_stage", "nb_tx"] > 0
+    # only transactions not resolved by rules or the first stage get full features
+    assert uncertain_sizes == [report.loc["model", "nb_tx"]]
+
+
+def test_compare_cascade(cascade):
+    comparison = compare_cascade(cascade, make_transactions(2000, random_state=1), "tx_fraud", top_k_list=[10])
+    assert list(comparison.index) == ["cascade", "full"]
+    assert all(comparison.auc_roc > 0.9)
+
+
+def add_customer_nb_tx(context_df, rows):
+    # number of earlier transactions of the customer in the context
+    customer_nb_tx = context_df.groupby("customer_id").cumcount().to_numpy()
+    return context_df.iloc[rows].assign(customer_nb_tx=customer_nb_tx[rows])
+
+
+def test_cascade_scorer_history_dependent_features():
+    tx_df = make_transactions(6000, random_state=0)
+    tx_df = add_customer_nb_tx(tx_df, np.arange(len(tx_df)))
+    tx_df["tx_fraud"] = ((tx_df.tx_amount > 220) | ((tx_df.tx_amount > 150) & (tx_df.customer_nb_tx >= 6))).astype(int)
+    train_df, history_df, test_df = tx_df.iloc[:3000], tx_df.iloc[:4000], tx_df.iloc[4000:]
+
+    cascade = CascadeScorer(
+        DecisionTreeClassifier(max_depth=4, random_state=0),
+        ["tx_amount", "customer_nb_tx"],
+        rules=RULES,
+        compute_features=add_customer_nb_tx,
+    ).fit(train_df, "tx_fraud")
+    predictions, report = cascade.predict(test_df.drop(columns="customer_nb_tx"), history_df=history_df)
+
+    # features of the uncertain transactions are derived with their history, as when scoring all transactions
+    expected = cascade.classifier.predict_proba(test_df[cascade.input_features])[:, 1]
+    model_rows = test_df.tx_amount.to_numpy() <= 220
+    assert report.loc["model", "nb_tx"] == model_rows.sum()
+    np.testing.assert_array_equal(predictions[model_rows], expected[model_rows])
+
+    comparison = compare_cascade(
+        cascade, test_df.drop(columns="customer_nb_tx"), "tx_fraud", top_k_list=[10], history_df=history_df
+    )
+    assert comparison.loc["full", "auc_roc"] == pytest.approx(comparison.loc["cascade", "auc_roc"], abs=0.05)
+    assert comparison.loc["full", "auc_roc"] > 0.95
+
+
+@pytest.fixture(scope="module")
+def raw_tx_df():
+    cust_df, term_df, tx_df = generate_dataset(
+        n_customers=100, n_terminals=100, nb_days=40, start_date="2018-04-01", r=30
+    )
+    return add_frauds(cust_df, term_df, tx_df, num_compomised_terminals_per_day=1, compromised_terminal_duration=7)
+
+
+@pytest.fixture(scope="module")
+def features_df(raw_tx_df):
+    return compute_features(raw_tx_df.copy(), window_sizes=[1, 7, 30], delay_period=7).set_index("transaction_id")
+
+
+@pytest.fixture(scope="module")
+def config():
+    return load_config(Path(__file__).parents[1] / "mvp" / "config.yaml")
+
+
+def test_entity_features(raw_tx_df, features_df, config):
+    rows = np.flatnonzero(raw_tx_df.tx_time_days.to_numpy() >= 35)[::7]
+    features = EntityFeatures(window_sizes=[1, 7, 30], delay_period=7)(raw_tx_df, rows)
+
+    input_features = config["data"]["features"]["input_features"]
+    assert list(features.transaction_id) == list(raw_tx_df.transaction_id.iloc[rows])
+    pd.testing.assert_frame_equal(
+        features[input_features],
+        features_df.loc[raw_tx_df.transaction_id.iloc[rows], input_features].reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_cascade_scorer_from_config(raw_tx_df, features_df, config):
+    cascade = CascadeScorer.from_config(
+        config, DecisionTreeClassifier(max_depth=4, random_state=0), DecisionTreeClassifier(max_depth=2, random_state=0)
+    )
+    assert cascade.rules == config["cascade"]["rules"]
+    assert cascade.upper_threshold == config["cascade"]["upper_threshold"]
+    assert isinstance(cascade.compute_features, EntityFeatures)
+    cascade.fit(features_df[features_df.tx_time_days < 30], "tx_fraud")
+
+    # test transactions only come with the cheap features of the rules and the first stage
+    is_test = raw_tx_df.tx_time_days.to_numpy() >= 33
+    history_df = raw_tx_df[~is_test]
+    test_df = raw_tx_df[is_test].join(features_df[["tx_during_weekend", "tx_during_night"]], on="transaction_id")
+
+    entity_features, model_rows = cascade.compute_features, []
+
+    def compute_features(context_df, rows):
+        model_rows.extend(rows - len(history_df))
+        return entity_features(context_df, rows)
+
+    cascade.compute_features = compute_features
+    predictions, report = cascade.predict(test_df, history_df=history_df)
+    cascade.compute_features = entity_features
+
+    # only uncertain transactions get full features, which match those derived from the whole dataset
+    assert 0 < len(model_rows) == report.loc["model", "nb_tx"] < len(test_df)
+    expected = cascade.classifier.predict_proba(features_df.loc[test_df.transaction_id, cascade.input_features])[:, 1]
+    np.testing.assert_array_equal(predictions[model_rows], expected[model_rows])
+
+    comparison = compare_cascade(cascade, test_df, "tx_fraud", top_k_list=[10], history_df=history_df)
+    assert list(comparison.index) == ["cascade", "full"]
+
+
+def test_cascade_scorer_unknown_operator():
+    with pytest.raises(ValueError):
+        CascadeScorer(DecisionTreeClassifier(), ["tx_amount"], rules=[{**RULES[0], "operator": "!="}])
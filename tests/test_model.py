@@ -0,0 +1,152 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import roc_auc_score
+from sklearn.tree import DecisionTreeClassifier
+
+from src.data.features import compute_features
+from src.data.generator import add_frauds, generate_dataset
+from src.data.io import list_partitions, save_partitions
+from src.model import compare_incremental_to_full_batch, compare_sampling_rates, fit_model, fit_model_incremental
+from src.utils import load_config
+
+INPUT_FEATURES = ["x1", "x2"]
+
+
+def make_transactions(n: int, day: int, random_state: int) -> pd.DataFrame:
+    rng = np.random.default_rng(random_state)
+    x1 = rng.normal(50, 20, n)
+    x2 = rng.uniform(0, 1, n)
+    tx_fraud = ((x1 > 80) & (x2 > 0.3)).astype(int)
+    customer_id = rng.integers(0, 100, n)
+    return pd.DataFrame({"x1": x1, "x2": x2, "customer_id": customer_id, "tx_time_days": day, "tx_fraud": tx_fraud})
+
+
+@pytest.fixture
+def partitions(tmp_path):
+    for day in range(5):
+        make_transactions(1000, day, random_state=day).to_pickle(tmp_path / f"2018-04-0{day + 1}.pkl")
+    return list_partitions(tmp_path)
+
+
+@pytest.fixture
+def test_df():
+    return make_transactions(1000, 7, random_state=42)
+
+
+def test_fit_model_incremental_matches_full_batch(partitions, test_df):
+    incremental = fit_model_incremental(
+        SGDClassifier(loss="log_loss", random_state=0), partitions, test_df, INPUT_FEATURES, "tx_fraud", n_epochs=5
+    )
+    train_df = pd.concat([pd.read_pickle(p) for p in partitions])
+    full_batch = fit_model(
+        SGDClassifier(loss="log_loss", random_state=0),
+        train_df,
+        test_df.copy(),
+        INPUT_FEATURES,
+        "tx_fraud",
+    )
+
+    auc_incremental = roc_auc_score(test_df.tx_fraud, incremental["predictions_test"])
+    auc_full_batch = roc_auc_score(test_df.tx_fraud, full_batch["predictions_test"])
+    assert auc_incremental > 0.9
+    assert abs(auc_incremental - auc_full_batch) < 0.05
+
+
+def test_fit_model_incremental_warm_start(partitions, test_df):
+    results = fit_model_incremental(
+        SGDClassifier(loss="log_loss", random_state=0), partitions[:-1], test_df, INPUT_FEATURES, "tx_fraud"
+    )
+    scaler_max = results["scaler"].data_max_.copy()
+
+    warm = fit_model_incremental(
+        results["classifier"], partitions[-1:], test_df, INPUT_FEATURES, "tx_fraud", scaler=results["scaler"]
+    )
+    assert warm["classifier"] is results["classifier"]
+    assert warm["classifier"].t_ > 4000
+    np.testing.assert_array_equal(warm["scaler"].data_max_, scaler_max)
+
+
+def test_fit_model_incremental_warm_start_requires_scaler(partitions, test_df):
+    results = fit_model_incremental(
+        SGDClassifier(loss="log_loss", random_state=0), partitions[:-1], test_df, INPUT_FEATURES, "tx_fraud"
+    )
+    with pytest.raises(ValueError):
+        fit_model_incremental(results["classifier"], partitions[-1:], test_df, INPUT_FEATURES, "tx_fraud")
+
+
+def test_fit_model_incremental_feature_partitions(tmp_path):
+    cust_df, term_df, tx_df = generate_dataset(
+        n_customers=50, n_terminals=50, nb_days=20, start_date="2018-04-01", r=30
+    )
+    tx_df = add_frauds(cust_df, term_df, tx_df, num_compomised_terminals_per_day=1, compromised_terminal_duration=3)
+    features_df = compute_features(tx_df, window_sizes=[1, 7, 30], delay_period=7)
+    partitions = save_partitions(features_df, tmp_path / "features")
+
+    config = load_config(Path(__file__).parents[1] / "mvp" / "config.yaml")
+    input_features = config["data"]["features"]["input_features"]
+    test_df = features_df[features_df.tx_time_days >= 15]
+    results = fit_model_incremental(
+        SGDClassifier(loss="log_loss", random_state=0),
+        partitions[:15],
+        test_df,
+        input_features,
+        config["data"]["features"]["output_feature"],
+    )
+    assert len(results["predictions_test"]) == len(test_df)
+
+
+def test_fit_model_incremental_requires_partial_fit(partitions, test_df):
+    with pytest.raises(TypeError):
+        fit_model_incremental(DecisionTreeClassifier(), partitions, test_df, INPUT_FEATURES, "tx_fraud")
+
+
+def test_compare_sampling_rates(partitions, test_df):
+    train_df = pd.concat([pd.read_pickle(p) for p in partitions], ignore_index=True)
+    report = compare_sampling_rates(
+        DecisionTreeClassifier(max_depth=3, random_state=0),
+        train_df,
+        test_df,
+        INPUT_FEATURES,
+        "tx_fraud",
+        sampling_rates=[1.0, 0.2],
+        top_k_list=[10],
+    )
+    assert list(report.sampling_rate) == [1.0, 0.2]
+    assert report.nb_train_tx.is_monotonic_decreasing
+    assert all(col in report.columns for col in ["training_execution_time", "auc_roc", "card_precision@10"])
+    assert all(report.auc_roc > 0.9)
+
+    report = compare_sampling_rates(
+        DecisionTreeClassifier(max_depth=3, random_state=0),
+        train_df,
+        test_df,
+        INPUT_FEATURES,
+        "tx_fraud",
+        sampling_rates=[0.1],
+        top_k_list=[10],
+        stratify_by="customer_id",
+        weighted=False,
+    )
+    nb_sampled = report.nb_train_tx[0] - train_df.tx_fraud.sum()
+    assert report.effective_sampling_rate[0] == pytest.approx(nb_sampled / (train_df.tx_fraud == 0).sum())
+    assert report.auc_roc[0] > 0.9
+
+
+def test_compare_incremental_to_full_batch(partitions, test_df):
+    report = compare_incremental_to_full_batch(
+        SGDClassifier(loss="log_loss", random_state=0),
+        partitions,
+        test_df,
+        INPUT_FEATURES,
+        "tx_fraud",
+        top_k_list=[10],
+        n_epochs=5,
+    )
+    assert list(report.index) == ["full_batch", "incremental"]
+    assert all(col in report.columns for col in ["training_execution_time", "auc_roc", "card_precision@10"])
+    assert report.loc["incremental", "auc_roc"] > 0.9
+    assert abs(report.loc["incremental", "auc_roc"] - report.loc["full_batch", "auc_roc"]) < 0.05
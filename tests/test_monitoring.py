@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.monitoring import DriftMonitor, QuantileSketch
+
+
+@pytest.fixture
+def tx_df():
+    rng = np.random.default_rng(0)
+    days = np.repeat(np.arange(14), 1000)
+    return pd.DataFrame(
+        {
+            "tx_time_days": days,
+            # amounts shift upwards in the second week
+            "tx_amount": rng.normal(50, 20, len(days)) + 30 * (days >= 7),
+            "tx_during_night": rng.integers(0, 2, len(days)),
+            "predictions": rng.uniform(0, 1, len(days)),
+        }
+    )
+
+
+def test_quantile_sketch():
+    values = np.random.default_rng(0).normal(0, 100, 10000)
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    sketch.update(values[:5000])
+    other = QuantileSketch(relative_accuracy=0.01)
+    other.update(np.append(values[5000:], np.nan))
+    sketch.merge(other)
+
+    assert sketch.count == 10000
+    for q in [0.01, 0.25, 0.5, 0.75, 0.99]:
+        expected = np.quantile(values, q, method="lower")
+        assert sketch.quantile(q) == pytest.approx(expected, rel=0.01, abs=1e-9)
+    assert len(sketch.positive) + len(sketch.negative) < 1000
+
+    with pytest.raises(ValueError):
+        sketch.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+def test_drift_monitor(tx_df, tmp_path):
+    monitor = DriftMonitor(["tx_amount", "tx_during_night", "predictions"])
+    for _, partition in tx_df.groupby("tx_time_days"):
+        monitor.update(partition)
+
+    stable = monitor.drift((0, 2), (3, 6))
+    shifted = monitor.drift((0, 6), (7, 13))
+    assert all(stable.psi < 0.05)
+    assert shifted.loc["tx_amount", "psi"] > 0.25
+    assert shifted.loc["tx_amount", "ks"] > 0.4
+    assert shifted.loc["predictions", "ks"] < 0.05
+
+    monitor.save(tmp_path / "drift.json")
+    loaded = DriftMonitor.load(tmp_path / "drift.json")
+    pd.testing.assert_frame_equal(loaded.drift((0, 6), (7, 13)), shifted)